@@ -1,10 +1,16 @@
 import argparse
-import json
 import os
 import shutil
+import math
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
-from bc.tools import youtube_ingest, transcript_parse, candidate_selector
+from bc.tools import youtube_ingest, candidate_selector
+from bc.tools.uploads_index import index as uploads_index
+from bc.tools.yt_quota import budget, QuotaExhausted
+from bc.tools.yt_metrics import usage
+from bc.tools.transcript_store import store as transcript_store
+from bc.tools.transcript_jobs import TranscriptJobs, write_json_atomic, CAPTION_WORKERS, WHISPER_WORKERS
 import sys, io
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -14,6 +20,12 @@ BASE_OUT = Path("bc/outputs")
 ARTIFACTS_DIR = BASE_OUT / "artifacts"
 SUGGESTIONS_DIR = BASE_OUT / "suggestions"
 REPORTS_DIR = BASE_OUT / "reports"
+CHANNELS_DIR = ARTIFACTS_DIR / "channels"
+
+CHANNEL_WORKERS = int(os.getenv("INGEST_CHANNEL_WORKERS", "4"))
+# reserved per channel when its size can't be looked up (channels.list failed)
+CHANNEL_QUOTA_ESTIMATE = int(os.getenv("YT_CHANNEL_QUOTA_ESTIMATE", "50"))
+MAX_UPLOAD_PAGES = 200  # candidate_selector's playlistItems page cap
 
 
 def _safe_clear_dir(dir_path: Path):
@@ -30,12 +42,134 @@ def _safe_clear_dir(dir_path: Path):
             print(f"⚠️ Could not remove {p}: {e}")
 
 
+def _read_channels(args, parser) -> list:
+    channels = list(args.channel)
+    if args.channels_file:
+        with open(args.channels_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    channels.append(line)
+    if not channels:
+        parser.error("give at least one --channel or a --channels-file")
+    resolved = []
+    for ref in channels:
+        try:
+            resolved.append(candidate_selector.resolve_channel_id(ref))
+        except Exception as e:
+            print(f"⚠️ Skipping channel {ref}: {e}")
+    if not resolved:
+        parser.error("no channel could be resolved")
+    return list(dict.fromkeys(resolved))  # dedupe, keep order
+
+
+def _estimate_quota(channel_id: str) -> int:
+    """Units a channel ingest is expected to cost, from what the uploads index knows."""
+    meta = uploads_index.get_channel(channel_id)
+    if meta and meta["complete"]:
+        known = len(uploads_index.known_ids(channel_id))
+        # 1 playlistItems page (304 / new uploads) + videos.list per 50 indexed uploads
+        return 1 + math.ceil(known / 50)
+    # first (or unfinished) listing: size it from statistics.videoCount (1 unit)
+    try:
+        count = candidate_selector.channel_overview(channel_id)["video_count"]
+    except QuotaExhausted:
+        raise
+    except Exception as e:
+        print(f"⚠️ [{channel_id}] Could not size channel ({e}); reserving {CHANNEL_QUOTA_ESTIMATE} units")
+        return CHANNEL_QUOTA_ESTIMATE
+    pages = min(MAX_UPLOAD_PAGES, math.ceil(count / 50))
+    # every playlistItems page + a videos.list call per 50 (aged) uploads
+    return max(1, 2 * pages)
+
+
+def _ingest_channel(channel_id: str, args, jobs: TranscriptJobs):
+    candidates = candidate_selector.select_backcatalog_candidates(
+        channel_id=channel_id,
+        age_days_min=args.age_days,
+        limit=args.limit
+    )
+    for v in candidates:
+        v["channel_id"] = channel_id
+    print(f"✅ [{channel_id}] Selected {len(candidates)} candidates.")
+
+    out_dir = CHANNELS_DIR / channel_id
+    artifacts_path = out_dir / "videos.json"
+    write_json_atomic(artifacts_path, candidates)
+    print(f"💾 [{channel_id}] Saved selected videos → {artifacts_path}")
+
+    # transcripts are fetched on the shared caption/Whisper pools; each result is
+    # flushed into this channel's videos.json as it lands
+    print(f"🎧 [{channel_id}] Queued {len(candidates)} transcript jobs (captions → Whisper fallback)")
+    return candidates, jobs.attach(candidates, artifacts_path)
+
+
+def _ingest_channels(channels: list, args, jobs: TranscriptJobs):
+    """
+    Ingests channels on a bounded pool. Before dispatching a channel its estimated
+    quota cost is reserved (released when it finishes); once the budget can't cover
+    the next channel even with nothing in flight, dispatching stops.
+    Returns ({channel_id: candidates}, [transcript futures], {channel_id: error}).
+    """
+    results = {}
+    transcripts = []
+    failed = {}
+    pending = list(channels)
+    running = {}
+    estimates = {}  # sized once, even if the channel waits for headroom
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency), thread_name_prefix="ingest") as pool:
+        while pending or running:
+            while pending and len(running) < max(1, args.concurrency):
+                ch = pending[0]
+                try:
+                    if ch not in estimates:
+                        estimates[ch] = _estimate_quota(ch)
+                    cost = estimates[ch]
+                except QuotaExhausted as e:
+                    print(f"⛔ [{ch}] {e}")
+                    failed[ch] = str(e)
+                    pending.clear()
+                    break
+                if not budget.try_reserve(cost):
+                    if running:
+                        break  # in-flight reservations may free up headroom; wait for one
+                    print(f"⏸️ Quota budget reached ({budget.remaining()} units left, next channel needs ~{cost}); "
+                          f"not dispatching {len(pending)} channel(s).")
+                    pending.clear()
+                    break
+                pending.pop(0)
+                running[pool.submit(_ingest_channel, ch, args, jobs)] = (ch, cost)
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                ch, cost = running.pop(fut)
+                budget.release(cost)
+                try:
+                    results[ch], futures = fut.result()
+                    transcripts.extend(futures)
+                except QuotaExhausted as e:
+                    print(f"⛔ [{ch}] {e}")
+                    failed[ch] = str(e)
+                    pending.clear()
+                except Exception as e:
+                    print(f"⚠️ [{ch}] Ingest failed: {e}")
+                    failed[ch] = str(e)
+    return results, transcripts, failed
+
+
 def main():
     parser = argparse.ArgumentParser(description="🎬 Back-Catalog Uplift Agent CLI")
 
     parser.add_argument("command", choices=["ingest"], help="Command to run")
 
-    parser.add_argument("--channel", required=True, help="YouTube channel ID or URL")
+    parser.add_argument("--channel", action="append", default=[],
+                        help="YouTube channel ID, channel URL or @handle (repeatable)")
+    parser.add_argument("--channels-file", help="File with one channel ID/URL/@handle per line (# comments allowed)")
+    parser.add_argument("--concurrency", type=int, default=CHANNEL_WORKERS, help="Channels ingested in parallel")
+    parser.add_argument("--quota", type=int, default=None,
+                        help="Daily YouTube API quota budget in units (default: YT_DAILY_QUOTA)")
     parser.add_argument("--limit", type=int, default=5, help="Number of videos to process")
     parser.add_argument("--age-days", type=int, default=180, help="Minimum video age in days")
 
@@ -72,38 +206,48 @@ def main():
         _safe_clear_dir(SUGGESTIONS_DIR)
 
     if args.command == "ingest":
-        print(f"\n🧠 Selecting top {args.limit} videos older than {args.age_days} days...\n")
-
-        candidates = candidate_selector.select_backcatalog_candidates(
-            channel_id=args.channel,
-            age_days_min=args.age_days,
-            pool_size=100,
-            limit=args.limit
-        )
-
-        print(f"✅ Selected {len(candidates)} candidates.")
-        print(json.dumps(candidates, indent=2))
+        if args.quota:
+            budget.daily_budget = args.quota
+        channels = _read_channels(args, parser)
+        print(f"\n🧠 Selecting top {args.limit} videos older than {args.age_days} days "
+              f"from {len(channels)} channel(s)...\n")
 
+        jobs = TranscriptJobs()
+        try:
+            results, transcripts, failed = _ingest_channels(channels, args, jobs)
+            if transcripts:
+                print(f"\n🎧 Waiting for {len(transcripts)} transcripts "
+                      f"({CAPTION_WORKERS} caption / {WHISPER_WORKERS} Whisper workers)...\n")
+            wait(transcripts)
+        finally:
+            jobs.shutdown()
+        print(f"🎧 Transcripts: {jobs.stats} | cache {transcript_store.usage()}")
+
+        merged = [v for ch in channels for v in results.get(ch) or []]
         artifacts_path = ARTIFACTS_DIR / "videos.json"
-        with open(artifacts_path, "w", encoding="utf-8") as f:
-            json.dump(candidates, f, indent=2)
-        print(f"💾 Saved selected videos → {artifacts_path}")
-
-        print("\n🎧 Starting transcript extraction via Whisper fallback...\n")
-        for v in candidates:
-            vid = v["video_id"]
-            try:
-                print(f"▶ Processing: {v['title']} ({vid})")
-                transcript = transcript_parse.get_transcript_text(vid)
-                v["first60_text"] = transcript[:1000] if transcript else None
-            except Exception as e:
-                print(f"⚠️ Failed for {vid}: {e}")
-
-        with open(artifacts_path, "w", encoding="utf-8") as f:
-            json.dump(candidates, f, indent=2)
+        write_json_atomic(artifacts_path, merged)
+        print(f"💾 Saved {len(merged)} videos from {sum(1 for ch in channels if ch in results)} channel(s) → {artifacts_path}")
+
+        budget.save()
+        usage.write(ARTIFACTS_DIR / "api_usage.json")
+        usage.print_summary()
+        print(f"💾 API usage → {ARTIFACTS_DIR / 'api_usage.json'}")
+        q = budget.snapshot()
+        print(f"📊 YouTube quota: {q['used']}/{q['daily_budget']} units used today ({q['remaining']} left) {q['by_endpoint']}")
+        if failed:
+            print(f"❌ {len(failed)} channel(s) failed:")
+            for ch, err in failed.items():
+                print(f"   - {ch}: {err}")
+        skipped = [ch for ch in channels if ch not in results and ch not in failed]
+        if skipped:
+            print(f"⏸️ {len(skipped)} channel(s) not ingested (quota budget): {', '.join(skipped[:10])}"
+                  f"{' ...' if len(skipped) > 10 else ''}")
+        if not results:
+            # nothing to hand to the downstream steps
+            print("\n❌ Phase 2 failed → no channel was ingested")
+            sys.exit(1)
 
         print("\n✅ Phase 2 complete → Transcripts updated in videos.json")
 
-
 if __name__ == "__main__":
     main()
@@ -1,32 +1,110 @@
 # bc/graphs/supervisor.py
 from pathlib import Path
+import os
+import sys
 import json
-from typing import Dict, Any, List
+import time
+import itertools
+from typing import Dict, Any, List, Tuple
 
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from bc.tools.model_registry import MODEL_NAME, get_model
 
 # ---- Config ----
-#MODEL_NAME = "google/gemma-3-270m"
-MODEL_NAME = "meta-llama/Llama-3.2-1B-Instruct"
-#MODEL_NAME = "Qwen/Qwen2.5-0.5B-Instruct"
+# MODEL_NAME comes from the shared model registry (LOCAL_MODEL_NAME) so the
+# Supervisor and shared_model.py reuse one loaded copy.
 
 ALLOWED_NODES = ["analyze_hook", "rewrite", "titlethumb", "policy", "report"]
 
+WEAK_HOOK_THRESHOLD = 0.4
+# hook_scores inside this band are "ambiguous": if the routing answer depends on
+# them, the LLM is consulted. Empty band (e.g. "0,0") → never call the LLM.
+AMBIGUOUS_BAND = tuple(float(x) for x in os.getenv("SUPERVISOR_AMBIGUOUS_BAND", "0.35,0.45").split(","))
+
+# Canonical state signature: (score_bucket, has_rw, has_tt, policy_done, wants_report)
+Signature = Tuple[str, bool, bool, bool, bool]
+SCORE_BUCKETS = ["none", "weak", "ambiguous", "ok"]
+
+
+def _score_bucket(score) -> str:
+    if score is None:
+        return "none"
+    lo, hi = AMBIGUOUS_BAND
+    if lo <= score < hi and lo < hi:
+        return "ambiguous"
+    return "weak" if score < WEAK_HOOK_THRESHOLD else "ok"
+
+
+def state_signature(state: Dict[str, Any]) -> Signature:
+    return (
+        _score_bucket(state.get("hook_score")),
+        bool(state.get("rewritten_script")),
+        bool(state.get("titlethumb_ideas")),
+        bool(state.get("policy_checked")),
+        bool(state.get("wants_report")),
+    )
+
+
+def _heuristic(sig: Signature, weak: bool) -> str:
+    """The rule-based answer (same rules as the LLM prompt guidance)."""
+    bucket, has_rw, has_tt, policy_done, wants_report = sig
+    # Hard rule: must run 'policy' before 'report'
+    if wants_report and not policy_done:
+        return "policy"
+    # If no hook_score yet → analyze
+    if bucket == "none":
+        return "analyze_hook"
+    # If no rewrite yet and hook_score is weak → rewrite
+    if not has_rw and weak:
+        return "rewrite"
+    # If no title/thumbnail ideas → titlethumb
+    if not has_tt:
+        return "titlethumb"
+    # If no policy check yet → policy
+    if not policy_done:
+        return "policy"
+    # Otherwise → report
+    return "report"
+
+
+def compile_routing_table() -> Dict[Signature, str | None]:
+    """
+    Enumerates every signature. Unambiguous ones map to a node; signatures whose
+    answer depends on where an ambiguous score falls map to None (→ LLM).
+    """
+    table = {}
+    for bucket, *flags in itertools.product(SCORE_BUCKETS, [False, True], [False, True], [False, True], [False, True]):
+        sig = (bucket, *flags)
+        if bucket == "ambiguous":
+            as_weak, as_ok = _heuristic(sig, weak=True), _heuristic(sig, weak=False)
+            table[sig] = as_weak if as_weak == as_ok else None
+        else:
+            table[sig] = _heuristic(sig, weak=(bucket == "weak"))
+    return table
+
+
+ROUTING_TABLE = compile_routing_table()
+
+
 class Supervisor:
-    def __init__(self, model_name: str = MODEL_NAME, device: str = "cpu"):
+    def __init__(self, model_name: str = MODEL_NAME, device: str | None = None):
         self.model_name = model_name
         self.device = device
-        self._load_model()
+        # model is loaded lazily — only ambiguous states ever need it
+        self.tokenizer = None
+        self.model = None
+        self._decisions: Dict[Signature, str] = {}
+        self.counters = {"table_hits": 0, "cache_hits": 0, "llm_calls": 0, "llm_fallbacks": 0}
 
     def _load_model(self):
         print(f"🧠 Loading Supervisor model: {self.model_name} ...")
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
-        if hasattr(self.model, "to"):
-            self.model.to(self.device)
+        loaded = get_model(self.model_name, device=self.device)
+        self.tokenizer = loaded.tokenizer
+        self.model = loaded.model
         print("✅ Supervisor model ready.")
 
     def _gen(self, prompt: str, max_new_tokens: int = 96) -> str:
+        if self.model is None:
+            self._load_model()
         messages = [{"role": "user", "content": prompt}]
         inputs = self.tokenizer.apply_chat_template(
             messages,
@@ -39,40 +117,112 @@ class Supervisor:
         text = self.tokenizer.decode(out[0][inputs["input_ids"].shape[-1]:], skip_special_tokens=True)
         return text.strip()
 
+    def _gen_batch(self, prompts: List[str], max_new_tokens: int = 8) -> List[str]:
+        """
+        One left-padded generate() call for many prompts (decoder-only models must
+        pad on the left so every row continues from its own last prompt token).
+        """
+        if self.model is None:
+            self._load_model()
+        tok = self.tokenizer
+        texts = [
+            tok.apply_chat_template([{"role": "user", "content": p}], add_generation_prompt=True, tokenize=False)
+            for p in prompts
+        ]
+        # the tokenizer is shared (shared_model) → borrow pad token / side, then restore
+        prev_pad, prev_side = tok.pad_token, tok.padding_side
+        try:
+            if tok.pad_token is None:
+                tok.pad_token = tok.eos_token
+            tok.padding_side = "left"
+            enc = tok(texts, return_tensors="pt", padding=True, add_special_tokens=False).to(self.model.device)
+            pad_id = tok.pad_token_id
+        finally:
+            tok.pad_token, tok.padding_side = prev_pad, prev_side
+        out = self.model.generate(
+            **enc,
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            pad_token_id=pad_id,
+        )
+        new_tokens = out[:, enc["input_ids"].shape[-1]:]
+        return [tok.decode(row, skip_special_tokens=True).strip() for row in new_tokens]
+
+    def stats(self) -> dict:
+        total = sum(self.counters[k] for k in ("table_hits", "cache_hits", "llm_calls"))
+        return {**self.counters, "decisions": total,
+                "llm_rate": round(self.counters["llm_calls"] / total, 3) if total else 0.0}
+
     def decide_next(self, state: Dict[str, Any]) -> str:
         """
         Decide next node based on current per-video state.
         Hard rule: must run 'policy' before 'report'.
+        Unambiguous states are answered from the compiled routing table; LLM
+        decisions for ambiguous states are memoized by state signature.
         """
-        # --- Minimal heuristic fallback (if LLM output invalid) ---
-        def fallback() -> str:
-            # If no hook_score yet → analyze
-            if state.get("hook_score") is None:
-                return "analyze_hook"
-            # If no rewrite yet and hook_score is weak → rewrite
-            if not state.get("rewritten_script") and (state.get("hook_score", 0) < 0.4):
-                return "rewrite"
-            # If no title/thumbnail ideas → titlethumb
-            if not state.get("titlethumb_ideas"):
-                return "titlethumb"
-            # If no policy check yet → policy
-            if not state.get("policy_checked"):
-                return "policy"
-            # Otherwise → report
-            return "report"
-
-        # --- Enforce the single hard constraint ---
-        if state.get("wants_report") and not state.get("policy_checked"):
-            return "policy"
-
-        # --- Build a compact prompt for the LLM supervisor ---
+        sig = state_signature(state)
+
+        # --- Fast path: compiled routing table (no inference) ---
+        routed = ROUTING_TABLE[sig]
+        if routed is not None:
+            self.counters["table_hits"] += 1
+            return routed
+
+        # --- Memoized LLM decision for this signature ---
+        if sig in self._decisions:
+            self.counters["cache_hits"] += 1
+            return self._decisions[sig]
+
+        choice = self._llm_decide(state, sig)
+        self._decisions[sig] = choice
+        return choice
+
+    def decide_next_batch(self, states: List[Dict[str, Any]], max_new_tokens: int = 8) -> List[str]:
+        """
+        Routes many videos at once. Table/memo hits are answered directly; the
+        remaining ambiguous signatures (deduplicated) share one generate() call.
+        Returns one decision per input state, in order.
+        """
+        sigs = [state_signature(st) for st in states]
+        decisions: List[str | None] = [None] * len(states)
+        pending: Dict[Signature, int] = {}  # signature → index of a representative state
+
+        for i, sig in enumerate(sigs):
+            routed = ROUTING_TABLE[sig]
+            if routed is not None:
+                self.counters["table_hits"] += 1
+                decisions[i] = routed
+            elif sig in self._decisions:
+                self.counters["cache_hits"] += 1
+                decisions[i] = self._decisions[sig]
+            elif sig not in pending:
+                pending[sig] = i
+            else:
+                self.counters["cache_hits"] += 1  # shares a pending LLM decision
+
+        if pending:
+            reps = list(pending.items())
+            self.counters["llm_calls"] += len(reps)
+            try:
+                outs = self._gen_batch([self._build_prompt(states[i]) for _, i in reps], max_new_tokens=max_new_tokens)
+            except Exception:
+                outs = [""] * len(reps)
+            for (sig, i), out in zip(reps, outs):
+                self._decisions[sig] = self._parse_choice(out, states[i], sig)
+
+        for i, sig in enumerate(sigs):
+            if decisions[i] is None:
+                decisions[i] = self._decisions[sig]
+        return decisions
+
+    def _build_prompt(self, state: Dict[str, Any]) -> str:
         score = state.get("hook_score")
         has_rw = bool(state.get("rewritten_script"))
         has_tt = bool(state.get("titlethumb_ideas"))
         policy_done = bool(state.get("policy_checked"))
         wants_report = bool(state.get("wants_report"))
 
-        prompt = f"""
+        return f"""
 You are a routing controller for an agentic content-uplift system.
 You must select exactly ONE next node from: {ALLOWED_NODES}.
 
@@ -93,16 +243,24 @@ Guidance:
 
 Reply with ONLY the node name (no extra text).
 """
+
+    def _parse_choice(self, out: str, state: Dict[str, Any], sig: Signature) -> str:
+        # --- Minimal heuristic fallback (if LLM output invalid) ---
+        choice = out.strip().split()[0].lower() if out.strip() else ""
+        # normalize
+        choice = choice.replace(".", "").replace("'", "")
+        if choice in ALLOWED_NODES:
+            return choice
+        self.counters["llm_fallbacks"] += 1
+        return _heuristic(sig, weak=(state.get("hook_score") or 0) < WEAK_HOOK_THRESHOLD)
+
+    def _llm_decide(self, state: Dict[str, Any], sig: Signature) -> str:
+        self.counters["llm_calls"] += 1
         try:
-            out = self._gen(prompt)
-            choice = out.strip().split()[0].lower()
-            # normalize
-            choice = choice.replace(".", "").replace("'", "")
-            if choice in ALLOWED_NODES:
-                return choice
-            return fallback()
+            return self._parse_choice(self._gen(self._build_prompt(state)), state, sig)
         except Exception:
-            return fallback()
+            self.counters["llm_fallbacks"] += 1
+            return _heuristic(sig, weak=(state.get("hook_score") or 0) < WEAK_HOOK_THRESHOLD)
 
 
 # ------ quick CLI test helper ------
@@ -118,7 +276,34 @@ def _demo():
     for i, st in enumerate(demo_states, 1):
         nxt = sup.decide_next(st)
         print(f"[{i}] next → {nxt} | state: {st}")
+    print(f"📊 Supervisor stats: {sup.stats()}")
+
+def _bench_batch(batch_sizes=(1, 2, 4, 8, 16), n_prompts: int = 16, max_new_tokens: int = 8):
+    """
+    Micro-benchmark: routing prompts through _gen_batch at different batch sizes.
+    Reports wall time, prompts/sec and generated tokens/sec (memo/table bypassed).
+    """
+    sup = Supervisor(MODEL_NAME)
+    prompts = [
+        sup._build_prompt({"hook_score": round(0.35 + 0.1 * i / n_prompts, 3), "rewritten_script": None,
+                           "titlethumb_ideas": None, "policy_checked": False, "wants_report": False})
+        for i in range(n_prompts)
+    ]
+    sup._gen_batch(prompts[:1], max_new_tokens=max_new_tokens)  # warm-up (load + first-call overhead)
+
+    print(f"{'batch':>5} | {'wall_s':>7} | {'prompts/s':>9} | {'tok/s':>7}")
+    for bs in batch_sizes:
+        t0 = time.perf_counter()
+        for i in range(0, n_prompts, bs):
+            sup._gen_batch(prompts[i:i + bs], max_new_tokens=max_new_tokens)
+        wall = time.perf_counter() - t0
+        gen_tokens = n_prompts * max_new_tokens  # upper bound; greedy routing rarely stops early
+        print(f"{bs:>5} | {wall:7.2f} | {n_prompts / wall:9.2f} | {gen_tokens / wall:7.1f}")
+
 
 if __name__ == "__main__":
-    _demo()
-__all__ = ["Supervisor", "_demo"]
+    if "--bench" in sys.argv:
+        _bench_batch()
+    else:
+        _demo()
+__all__ = ["Supervisor", "ROUTING_TABLE", "state_signature", "_demo", "_bench_batch"]
@@ -3,8 +3,16 @@ LangGraph DAG – Back-Catalog Uplift Agent
 ----------------------------------------
 Agentic workflow connecting:
 hook_rewrite → description_rewrite → title_thumb_scout → policy_guard → reporter
+
+Optional combined mode (UPLIFT_COMBINED=1 or --combined):
+uplift_combined → policy_guard → reporter
+
+LLM backend: LLM_BACKEND=bedrock|local|fake or --backend (see llm_backends.py).
+Catalog sweeps: UPLIFT_BATCH=1 or --batch spools prompts into batch jobs (see batch_spool.py).
 """
 
+import os
+import argparse
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
 from bc.tools.hook_rewrite import hook_rewrite
@@ -12,6 +20,9 @@ from bc.tools.description_rewrite import description_rewrite
 from bc.tools.title_thumb_scout import title_thumb_scout
 from bc.tools.policy_guard import policy_guard
 from bc.tools.reporter import reporter
+from bc.tools.uplift_combined import uplift_combined
+from bc.tools.llm_backends import BACKENDS, set_backend, backend_stats
+from bc.tools.batch_spool import set_batch_mode
 
 
 # === Define the State Schema ===
@@ -49,6 +60,14 @@ def node_title_thumb(state: VideoState):
     return state
 
 
+def node_uplift_combined(state: VideoState):
+    print("\n🧩 Steps 1–3: Combined Hook + Description + Title/Thumbnail")
+    uplift_combined()
+    state.step = "uplift_done"
+    state.last_output = "hook_rewrites.json, description_rewrites.json, titlethumb.json"
+    return state
+
+
 def node_policy_guard(state: VideoState):
     print("\n🧩 Step 4: Policy Compliance Check")
     policy_guard()
@@ -66,9 +85,23 @@ def node_reporter(state: VideoState):
 
 
 # === Build the Graph ===
-def build_uplift_graph():
+COMBINED = os.getenv("UPLIFT_COMBINED", "0").lower() in ("1", "true", "yes")
+
+
+def build_uplift_graph(combined: bool = COMBINED):
     graph = StateGraph(VideoState)
 
+    if combined:
+        # One multi-task prompt per video instead of three round-trips
+        graph.add_node("uplift", node_uplift_combined)
+        graph.add_node("policy", node_policy_guard)
+        graph.add_node("report", node_reporter)
+        graph.add_edge("uplift", "policy")
+        graph.add_edge("policy", "report")
+        graph.add_edge("report", END)
+        graph.set_entry_point("uplift")
+        return graph.compile()
+
     # Add nodes
     graph.add_node("rewrite", node_hook_rewrite)
     graph.add_node("description", node_description_rewrite)
@@ -90,9 +123,9 @@ def build_uplift_graph():
 
 
 # === Run Compiled Graph ===
-def run_uplift_graph():
+def run_uplift_graph(combined: bool = COMBINED):
     print("🧠 Building and running Uplift LangGraph DAG...\n")
-    compiled = build_uplift_graph()
+    compiled = build_uplift_graph(combined=combined)
 
     # initial input state
     initial_state = {"channel_id": "UCHnyfMqiRRG1u-2MsSQLbXA", "limit": 2}
@@ -108,8 +141,21 @@ def run_uplift_graph():
         else:
             print(f"📍 Event: {event}")
 
+    print(f"📊 LLM backend stats: {backend_stats()}")
     print("✅ LangGraph workflow completed successfully!\n")
 
 
 if __name__ == "__main__":
-    run_uplift_graph()
+    parser = argparse.ArgumentParser(description="Run the Back-Catalog Uplift DAG")
+    parser.add_argument("--combined", action="store_true",
+                        help="Use one multi-task prompt per video (hook + description + titles)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="LLM backend for all tools (default: $LLM_BACKEND or bedrock)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Spool rewrite/description/title prompts into offline batch jobs")
+    args = parser.parse_args()
+    if args.batch:
+        set_batch_mode(True)
+    if args.backend:
+        set_backend(args.backend)
+    run_uplift_graph(combined=args.combined or COMBINED)
@@ -0,0 +1,344 @@
+"""
+In-process ASR engine (Whisper fallback)
+----------------------------------------
+Replaces one `whisper` CLI subprocess per video (which reloads the model from disk
+every time) with a warm, in-process service:
+
+- AsrEngine: one loaded model. Backends (ASR_BACKEND):
+    openai  → openai-whisper (PyTorch)
+    faster  → faster-whisper (CTranslate2; ASR_COMPUTE_TYPE=int8 on CPU)
+- AsrService: ASR_WORKERS threads, each loading its own engine once, fed from one
+  queue. A worker drains up to ASR_BATCH queued clips and decodes them together
+  (openai: 30 s mel windows of all clips in one batched, timestamped decode;
+  faster: batched pipeline over each clip's chunks).
+
+Clips are VAD-trimmed first (vad.py, ASR_VAD=1) so music beds and silence never
+reach the model. Every result carries the real-time factor (asr seconds / clip
+seconds) and, with VAD, the fraction skipped and the estimated ASR time saved.
+
+Benchmark against the bundled clip:
+    python -m bc.tools.asr_engine --bench U2g1H5wPmUE.mp3
+"""
+
+import os
+import time
+import queue
+import argparse
+import threading
+import subprocess
+import tempfile
+from concurrent.futures import Future
+
+import numpy as np
+
+from bc.tools import vad
+from bc.tools.audio_fetch import decode_pcm, SAMPLE_RATE
+
+WINDOW_S = 30  # Whisper's fixed input window
+
+ASR_BACKEND = os.getenv("ASR_BACKEND", "openai").lower()
+ASR_MODEL = os.getenv("ASR_MODEL", "base")
+ASR_DEVICE = os.getenv("ASR_DEVICE", "cpu")
+ASR_COMPUTE_TYPE = os.getenv("ASR_COMPUTE_TYPE", "int8")
+ASR_LANGUAGE = os.getenv("ASR_LANGUAGE", "en")
+ASR_WORKERS = int(os.getenv("ASR_WORKERS", "1"))
+ASR_BATCH = int(os.getenv("ASR_BATCH", "4"))
+ASR_THREADS = int(os.getenv("ASR_THREADS", "0"))  # 0 = library default
+ASR_VAD = os.getenv("ASR_VAD", "1") == "1"  # decode only speech regions (vad.py)
+
+
+class AsrEngine:
+    def __init__(self, backend: str = ASR_BACKEND, model_name: str = ASR_MODEL,
+                 device: str = ASR_DEVICE, compute_type: str = ASR_COMPUTE_TYPE):
+        self.backend = backend
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type
+        self.load_s = 0.0
+        self._model = None
+        self._batched = None
+
+    @property
+    def label(self) -> str:
+        if self.backend == "faster":
+            return f"faster-whisper/{self.model_name} ({self.compute_type})"
+        return f"openai-whisper/{self.model_name}"
+
+    # --- model ---
+    def load(self):
+        if self._model is not None:
+            return self
+        t0 = time.perf_counter()
+        if self.backend == "faster":
+            from faster_whisper import WhisperModel
+            kwargs = {"device": self.device, "compute_type": self.compute_type}
+            if ASR_THREADS:
+                kwargs["cpu_threads"] = ASR_THREADS
+            self._model = WhisperModel(self.model_name, **kwargs)
+            try:
+                from faster_whisper import BatchedInferencePipeline
+                self._batched = BatchedInferencePipeline(model=self._model)
+            except ImportError:  # faster-whisper < 1.1
+                self._batched = None
+        elif self.backend == "openai":
+            import whisper
+            if ASR_THREADS:
+                import torch
+                torch.set_num_threads(ASR_THREADS)
+            self._model = whisper.load_model(self.model_name, device=self.device)
+        else:
+            raise ValueError(f"Unknown ASR_BACKEND '{self.backend}' (expected openai|faster)")
+        self.load_s = time.perf_counter() - t0
+        print(f"🎙️ ASR model loaded: {self.label} in {self.load_s:.1f}s")
+        return self
+
+    # --- audio ---
+    def load_audio(self, audio) -> np.ndarray:
+        """Path → 16 kHz mono float32 via the ffmpeg pipe decoder; arrays pass through."""
+        if isinstance(audio, np.ndarray):
+            return audio.astype(np.float32, copy=False)
+        return decode_pcm(str(audio), seconds=None)
+
+    # --- transcription ---
+    def transcribe(self, audio) -> dict:
+        return self.transcribe_batch([audio])[0]
+
+    def transcribe_batch(self, clips: list, use_vad: bool | None = None) -> list:
+        """
+        clips: paths or 16 kHz float32 arrays. Returns one dict per clip:
+        {text, segments: [{start, end, text}], duration_s, asr_s, rtf, backend, vad}
+        With VAD on, only speech regions are decoded; segment times stay on the
+        original clip timeline.
+        """
+        use_vad = ASR_VAD if use_vad is None else use_vad
+        self.load()
+        arrays = [self.load_audio(c) for c in clips]
+        trims = [vad.trim(a) for a in arrays] if use_vad else [None] * len(arrays)
+        inputs = [t["audio"] if t else a for a, t in zip(arrays, trims)]
+
+        # clips with no detected speech skip the model entirely
+        live = [i for i, a in enumerate(inputs) if len(a)]
+        outs = [[] for _ in inputs]
+        t0 = time.perf_counter()
+        if live:
+            batch = [inputs[i] for i in live]
+            if self.backend == "faster":
+                decoded = [self._faster_one(a) for a in batch]
+            elif len(batch) == 1:
+                decoded = [self._openai_one(batch[0])]
+            else:
+                decoded = self._openai_batch(batch)
+            for i, segs in zip(live, decoded):
+                outs[i] = segs
+        asr_s = time.perf_counter() - t0
+
+        total_input = sum(len(inputs[i]) for i in live) / SAMPLE_RATE or 1.0
+        rtf_decoded = asr_s / total_input  # seconds of ASR per second of audio actually decoded
+        results = []
+        for a, inp, t, segments in zip(arrays, inputs, trims, outs):
+            duration = len(a) / SAMPLE_RATE
+            share = asr_s * (len(inp) / SAMPLE_RATE / total_input) if len(inp) else 0.0
+            if t:
+                for seg in segments:
+                    seg["start"] = vad.remap_time(seg["start"], t["offsets"])
+                    seg["end"] = vad.remap_time(seg["end"], t["offsets"], end=True)
+            results.append({
+                "text": "\n".join(s["text"] for s in segments if s["text"]),
+                "segments": segments,
+                "duration_s": round(duration, 2),
+                "asr_s": round(share, 3),
+                "rtf": round(share / duration, 4) if duration else 0.0,
+                "backend": self.label,
+                "vad": None if t is None else {
+                    "backend": t["backend"],
+                    "speech_s": t["speech_s"],
+                    "skipped_fraction": t["skipped_fraction"],
+                    "fallback": t["fallback"],  # VAD kept ~nothing of audible audio → whole clip decoded
+                    # what the skipped audio would have cost at this batch's decode rate
+                    "asr_saved_s": round((duration - len(inp) / SAMPLE_RATE) * rtf_decoded, 3),
+                },
+            })
+        return results
+
+    def _openai_one(self, audio: np.ndarray) -> list:
+        r = self._model.transcribe(audio, language=ASR_LANGUAGE, fp16=self.device != "cpu", verbose=None)
+        return [{"start": round(s["start"], 2), "end": round(s["end"], 2), "text": s["text"].strip()}
+                for s in r.get("segments", [])]
+
+    def _openai_batch(self, arrays: list) -> list:
+        # every 30 s window of every clip → one batched decode, with timestamp tokens
+        # so segments match _openai_one's granularity (not one segment per window)
+        import whisper
+        from whisper.tokenizer import get_tokenizer
+        mels, owners = [], []
+        for i, a in enumerate(arrays):
+            step = WINDOW_S * SAMPLE_RATE
+            for off in range(0, max(1, len(a)), step):
+                window = whisper.pad_or_trim(a[off:off + step])
+                mels.append(whisper.log_mel_spectrogram(window, n_mels=self._model.dims.n_mels))
+                owners.append((i, off / SAMPLE_RATE, min(len(a), off + step) / SAMPLE_RATE))
+        import torch
+        batch = torch.stack(mels).to(self._model.device)
+        options = whisper.DecodingOptions(language=ASR_LANGUAGE, fp16=self.device != "cpu",
+                                          without_timestamps=False)
+        decoded = whisper.decode(self._model, batch, options)
+        tokenizer = get_tokenizer(self._model.is_multilingual, num_languages=self._model.num_languages,
+                                  language=ASR_LANGUAGE, task="transcribe")
+
+        outs = [[] for _ in arrays]
+        for (i, start, end), d in zip(owners, decoded):
+            outs[i].extend(_timestamp_segments(d.tokens, tokenizer, start, end))
+        return outs
+
+    def _faster_one(self, audio: np.ndarray) -> list:
+        if self._batched is not None:
+            segs, _ = self._batched.transcribe(audio, language=ASR_LANGUAGE, batch_size=max(1, ASR_BATCH))
+        else:
+            segs, _ = self._model.transcribe(audio, language=ASR_LANGUAGE, beam_size=1)
+        return [{"start": round(s.start, 2), "end": round(s.end, 2), "text": s.text.strip()} for s in segs]
+
+
+def _timestamp_segments(tokens, tokenizer, offset: float, limit: float) -> list:
+    """
+    Split one window's decoded tokens on Whisper timestamp tokens
+    (<|0.00|> text <|2.40|><|2.40|> text <|5.00|> ...) into clip-timeline segments.
+    Text left without a closing timestamp runs to the end of the window.
+    """
+    ts_begin = tokenizer.timestamp_begin
+    segments, text, start = [], [], 0.0
+
+    def emit(end: float):
+        line = tokenizer.decode(text).strip()
+        if line:
+            segments.append({"start": round(min(offset + start, limit), 2),
+                             "end": round(min(offset + end, limit), 2), "text": line})
+
+    for tok in tokens:
+        if tok >= ts_begin:
+            t = (tok - ts_begin) * 0.02  # 20 ms per timestamp token
+            if text:
+                emit(t)
+                text = []
+            start = t
+        elif tok < tokenizer.eot:
+            text.append(tok)
+    if text:
+        emit(limit - offset)
+    return segments
+
+
+class AsrService:
+    """
+    Warm ASR workers behind one queue. submit() returns a Future with the
+    transcribe_batch() dict for that clip.
+    """
+
+    def __init__(self, workers: int = ASR_WORKERS, batch: int = ASR_BATCH, backend: str = ASR_BACKEND):
+        self.batch = max(1, batch)
+        self.backend = backend
+        self._q = queue.Queue()
+        self._lock = threading.Lock()
+        self.stats = {"clips": 0, "batches": 0, "audio_s": 0.0, "asr_s": 0.0}
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"asr-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, audio) -> Future:
+        fut = Future()
+        self._q.put((audio, fut))
+        return fut
+
+    def transcribe(self, audio) -> dict:
+        return self.submit(audio).result()
+
+    def _worker(self):
+        engine = AsrEngine(backend=self.backend)  # model loads on the first clip, once per worker
+        while True:
+            jobs = [self._q.get()]
+            while len(jobs) < self.batch:
+                try:
+                    jobs.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                results = engine.transcribe_batch([a for a, _ in jobs])
+            except Exception as e:
+                for _, fut in jobs:
+                    fut.set_exception(e)
+                continue
+            with self._lock:
+                self.stats["batches"] += 1
+                for r in results:
+                    self.stats["clips"] += 1
+                    self.stats["audio_s"] += r["duration_s"]
+                    self.stats["asr_s"] += r["asr_s"]
+            for (_, fut), r in zip(jobs, results):
+                fut.set_result(r)
+
+    def report(self) -> dict:
+        with self._lock:
+            s = dict(self.stats)
+        s["rtf"] = round(s["asr_s"] / s["audio_s"], 4) if s["audio_s"] else 0.0
+        return s
+
+
+# --- process-wide service (lazy) ---
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> AsrService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = AsrService()
+    return _service
+
+
+# ------ quick benchmark: CLI subprocess per clip vs. warm engine ------
+def _bench(path: str = "U2g1H5wPmUE.mp3", n: int = 3, seconds: int = 90):
+    engine = AsrEngine()
+    audio = decode_pcm(path, seconds=seconds)
+    print(f"clip: {path} | {len(audio) / SAMPLE_RATE:.1f}s of audio | backend {engine.label}")
+
+    engine.load()
+    print(f"model load: {engine.load_s:.2f}s (paid once per worker)")
+    for i in range(n):
+        r = engine.transcribe_batch([audio], use_vad=False)[0]
+        print(f"warm #{i + 1}: {r['asr_s']:.2f}s | RTF {r['rtf']:.3f} | {len(r['segments'])} segments")
+
+    r = engine.transcribe_batch([audio], use_vad=True)[0]
+    v = r["vad"]
+    print(f"warm + VAD ({v['backend']}): {r['asr_s']:.2f}s | RTF {r['rtf']:.3f} | "
+          f"skipped {v['skipped_fraction']:.0%} of audio | ~{v['asr_saved_s']:.2f}s ASR saved")
+
+    batch = engine.transcribe_batch([audio] * n, use_vad=False)
+    total = sum(r["asr_s"] for r in batch)
+    print(f"batch x{n}: {total:.2f}s total | RTF {batch[0]['rtf']:.3f}")
+
+    if engine.backend == "openai":
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                t0 = time.perf_counter()
+                subprocess.run(["whisper", path, "--language", ASR_LANGUAGE, "--model", engine.model_name,
+                                "--clip_timestamps", f"0,{seconds}", "--output_dir", tmp],
+                               check=True, capture_output=True)
+                print(f"whisper CLI (cold, per video): {time.perf_counter() - t0:.2f}s")
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"(whisper CLI comparison skipped: {e})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm in-process Whisper engine")
+    parser.add_argument("--bench", metavar="AUDIO", nargs="?", const="U2g1H5wPmUE.mp3")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seconds", type=int, default=90)
+    args = parser.parse_args()
+    if args.bench:
+        _bench(args.bench, args.runs, args.seconds)
+    else:
+        parser.print_help()
@@ -0,0 +1,115 @@
+"""
+Range-limited audio fetch + in-memory PCM decode
+------------------------------------------------
+Whisper fallback audio without intermediate files:
+
+1. yt-dlp only *resolves* the best audio stream URL (-g), nothing is downloaded.
+2. ffmpeg reads just the first N seconds of that stream (`-t` as an input option,
+   so it stops fetching once it has them) and decodes straight to 16 kHz mono
+   s16le on stdout.
+3. The pipe is read into a float32 NumPy buffer that asr_engine accepts directly.
+
+No MP3, no re-encode, nothing written to the CWD. decode_pcm() works on any local
+file too, so it can be checked offline:
+    python -m bc.tools.audio_fetch --decode U2g1H5wPmUE.mp3
+"""
+
+import os
+import time
+import argparse
+import subprocess
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+CLIP_SECONDS = int(os.getenv("ASR_CLIP_SECONDS", "90"))
+COOKIES_FILE = os.getenv("YTDLP_COOKIES", "cookies.txt")
+FFMPEG = os.getenv("FFMPEG_BIN", "ffmpeg")
+YTDLP = os.getenv("YTDLP_BIN", "yt-dlp")
+
+USER_AGENTS = [
+    # desktop
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    # android mobile
+    "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Mobile Safari/537.36",
+    # ios safari
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 16_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.2 Mobile Safari/604.1",
+]
+
+
+def decode_pcm(source: str, seconds: float | None = CLIP_SECONDS, user_agent: str | None = None) -> np.ndarray:
+    """
+    Decode the first `seconds` of a file or URL to 16 kHz mono float32 in [-1, 1].
+    seconds=None decodes everything.
+    """
+    cmd = [FFMPEG, "-nostdin", "-hide_banner", "-loglevel", "error"]
+    if source.startswith(("http://", "https://")):
+        cmd += ["-reconnect", "1", "-reconnect_streamed", "1"]
+        if user_agent:
+            cmd += ["-user_agent", user_agent]
+    if seconds:
+        cmd += ["-t", str(seconds)]  # input option: stop reading the source after N seconds
+    cmd += ["-i", source, "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "pipe:1"]
+
+    proc = subprocess.run(cmd, capture_output=True, check=False)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg decode failed: {proc.stderr.decode(errors='ignore').strip()[:300]}")
+    return np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def resolve_audio_url(video_id: str, user_agent: str) -> str | None:
+    """Best audio-only stream URL via yt-dlp (metadata request only, no download)."""
+    cmd = [YTDLP, "--no-warnings", "-f", "bestaudio/best", "-g", "--user-agent", user_agent]
+    if os.path.exists(COOKIES_FILE):
+        cmd += ["--cookies", COOKIES_FILE]
+    cmd.append(f"https://www.youtube.com/watch?v={video_id}")
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout.strip().splitlines()
+    return out[0] if out else None
+
+
+def fetch_audio_pcm(video_id: str, seconds: float = CLIP_SECONDS) -> np.ndarray | None:
+    """
+    First `seconds` of a video's audio as 16 kHz mono float32, retrying with
+    different user agents (and cookies.txt if present). None if every attempt fails.
+    """
+    for ua in USER_AGENTS:
+        try:
+            print(f"🎧 Resolving audio stream with UA: {ua.split('(')[0].strip()}...")
+            url = resolve_audio_url(video_id, ua)
+            if not url:
+                continue
+            pcm = decode_pcm(url, seconds=seconds, user_agent=ua)
+            if pcm.size:
+                print(f"✅ Decoded {pcm.size / SAMPLE_RATE:.1f}s of audio in memory with {ua[:25]}...")
+                return pcm
+        except (subprocess.CalledProcessError, RuntimeError) as e:
+            print(f"⚠️ Attempt failed with user-agent: {ua[:40]}... ({e})")
+
+    print("❌ All user-agents failed; YouTube may require login or region cookies.")
+    return None
+
+
+# ------ offline check: decode the bundled clip ------
+def _bench(path: str = "U2g1H5wPmUE.mp3", seconds: float = CLIP_SECONDS):
+    t0 = time.perf_counter()
+    pcm = decode_pcm(path, seconds=seconds)
+    wall = time.perf_counter() - t0
+    print(f"decoded {path}: {pcm.size:,} samples = {pcm.size / SAMPLE_RATE:.2f}s @ {SAMPLE_RATE} Hz mono "
+          f"| {pcm.nbytes / 1e6:.1f} MB float32 | {wall * 1000:.0f} ms "
+          f"| peak {float(np.abs(pcm).max()) if pcm.size else 0.0:.3f}")
+    return pcm
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Range-limited audio fetch / PCM decode")
+    parser.add_argument("--decode", metavar="FILE_OR_URL", help="Decode a local file or URL and report")
+    parser.add_argument("--video", help="Fetch the first N seconds of a YouTube video")
+    parser.add_argument("--seconds", type=float, default=CLIP_SECONDS)
+    args = parser.parse_args()
+    if args.decode:
+        _bench(args.decode, args.seconds)
+    elif args.video:
+        pcm = fetch_audio_pcm(args.video, args.seconds)
+        print(f"{args.video}: {0 if pcm is None else pcm.size / SAMPLE_RATE:.1f}s decoded")
+    else:
+        parser.print_help()
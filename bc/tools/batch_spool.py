@@ -0,0 +1,234 @@
+"""
+Offline batch-inference spool
+-----------------------------
+For catalog-scale sweeps the rewrite / description / title tools can spool all
+prompts into one JSONL job file (Bedrock batch-inference record format), submit it
+as a single job, and fold the `.jsonl.out` results back into their suggestion files.
+
+Job record:   {"recordId": "<stable id>", "modelInput": {"prompt", "max_gen_len", "temperature"}}
+Result record: same + {"modelOutput": {"generation": "..."}} or {"error": {...}}
+
+Services:
+- LocalDirBatchService (default) – stand-in for S3 + Bedrock batch. Jobs live under
+  bc/outputs/batch/{input,output,jobs}; "processing" runs each record through the
+  configured LLM backend.
+- S3BatchService – real Bedrock batch inference (create_model_invocation_job); used
+  when BATCH_S3_URI and BATCH_ROLE_ARN are set. Note Bedrock enforces a minimum
+  record count per job.
+
+Enable for the tools with UPLIFT_BATCH=1, `set_batch_mode(True)` or
+`python -m bc.graphs.uplift_graph --batch`. Interactive runs keep the synchronous path.
+"""
+
+import os
+import json
+import time
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+from bc.tools.prompt_format import format_llama3_prompt, extract_user_prompt
+
+# === CONFIG ===
+BASE_DIR = Path(__file__).resolve().parent.parent
+BATCH_DIR = Path(os.getenv("BATCH_DIR", BASE_DIR / "outputs" / "batch"))
+BATCH_MODE = os.getenv("UPLIFT_BATCH", "0").lower() in ("1", "true", "yes")
+S3_URI = os.getenv("BATCH_S3_URI", "")          # e.g. s3://my-bucket/bc-batch
+ROLE_ARN = os.getenv("BATCH_ROLE_ARN", "")
+POLL_SECONDS = float(os.getenv("BATCH_POLL_SECONDS", "30"))
+
+
+def set_batch_mode(enabled: bool):
+    global BATCH_MODE
+    BATCH_MODE = bool(enabled)
+
+
+def record_id(tool: str, video_id: str) -> str:
+    """Stable 11-char alphanumeric record ID (Bedrock batch format)."""
+    return hashlib.sha1(f"{tool}:{video_id}".encode("utf-8")).hexdigest()[:11].upper()
+
+
+def _write_jsonl(path: Path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+
+
+def _read_jsonl(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+# === SPOOL ===
+def spool_job(tool: str, records, max_tokens: int = 500, temperature: float = 0.7) -> str:
+    """
+    records: iterable of (video_id, prompt).
+    Writes input/{job_id}.jsonl and returns job_id.
+    """
+    job_id = f"{tool}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+    rows = [
+        {
+            "recordId": record_id(tool, video_id),
+            "modelInput": {
+                "prompt": format_llama3_prompt(prompt),
+                "max_gen_len": max_tokens,
+                "temperature": temperature,
+            },
+        }
+        for video_id, prompt in records
+    ]
+    _write_jsonl(BATCH_DIR / "input" / f"{job_id}.jsonl", rows)
+    print(f"📦 Spooled {len(rows)} records → {BATCH_DIR / 'input' / (job_id + '.jsonl')}")
+    return job_id
+
+
+# === SERVICES ===
+class LocalDirBatchService:
+    """Processes spooled jobs from the local batch directory."""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+
+    def submit(self, job_id: str) -> str:
+        from bc.tools.llm_backends import get_backend_for
+
+        in_path = BATCH_DIR / "input" / f"{job_id}.jsonl"
+        rows = list(_read_jsonl(in_path))
+        self._status(job_id, "InProgress", len(rows))
+
+        backend = get_backend_for(self.tool)
+        groups = {}
+        for i, row in enumerate(rows):
+            mi = row["modelInput"]
+            groups.setdefault((mi["max_gen_len"], mi["temperature"]), []).append(i)
+
+        out_rows = list(rows)
+        for (max_gen_len, temperature), idxs in groups.items():
+            prompts = [extract_user_prompt(rows[i]["modelInput"]["prompt"]) for i in idxs]
+            outputs = backend.generate_batch(prompts, max_tokens=max_gen_len, temperature=temperature)
+            for i, text in zip(idxs, outputs):
+                if text:
+                    out_rows[i] = {**rows[i], "modelOutput": {"generation": text}}
+                else:
+                    out_rows[i] = {**rows[i], "error": {"errorCode": 500, "errorMessage": "empty generation"}}
+
+        _write_jsonl(BATCH_DIR / "output" / f"{job_id}.jsonl.out", out_rows)
+        self._status(job_id, "Completed", len(rows))
+        return job_id
+
+    def wait(self, job_id: str) -> Path:
+        return BATCH_DIR / "output" / f"{job_id}.jsonl.out"
+
+    def _status(self, job_id: str, status: str, n: int):
+        path = BATCH_DIR / "jobs" / f"{job_id}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"job_id": job_id, "tool": self.tool, "status": status, "records": n,
+                       "updated": datetime.now().isoformat()}, f, indent=2)
+
+
+class S3BatchService:
+    """Bedrock batch inference via S3 (create_model_invocation_job)."""
+
+    def __init__(self, tool: str):
+        import boto3
+        self.tool = tool
+        region = os.getenv("AWS_REGION", "us-west-2")
+        self.s3 = boto3.client("s3", region_name=region)
+        self.bedrock = boto3.client("bedrock", region_name=region)
+        self.model_id = os.getenv("BEDROCK_MODEL_ID", "meta.llama3-8b-instruct-v1:0")
+        self.bucket, _, prefix = S3_URI.replace("s3://", "", 1).partition("/")
+        self.prefix = prefix.strip("/")
+        self._arns = {}
+
+    def _key(self, *parts) -> str:
+        return "/".join(p for p in (self.prefix, *parts) if p)
+
+    def submit(self, job_id: str) -> str:
+        in_path = BATCH_DIR / "input" / f"{job_id}.jsonl"
+        in_key = self._key("input", in_path.name)
+        self.s3.upload_file(str(in_path), self.bucket, in_key)
+        resp = self.bedrock.create_model_invocation_job(
+            jobName=job_id,
+            roleArn=ROLE_ARN,
+            modelId=self.model_id,
+            inputDataConfig={"s3InputDataConfig": {"s3Uri": f"s3://{self.bucket}/{in_key}"}},
+            outputDataConfig={"s3OutputDataConfig": {"s3Uri": f"s3://{self.bucket}/{self._key('output')}/"}},
+        )
+        self._arns[job_id] = resp["jobArn"]
+        print(f"🚀 Submitted Bedrock batch job {job_id} ({resp['jobArn']})")
+        return job_id
+
+    def wait(self, job_id: str) -> Path:
+        arn = self._arns[job_id]
+        while True:
+            status = self.bedrock.get_model_invocation_job(jobIdentifier=arn)["status"]
+            if status == "Completed":
+                break
+            if status in ("Failed", "Stopped", "Expired", "PartiallyCompleted"):
+                print(f"⚠️ Batch job {job_id} ended with status {status}")
+                if status != "PartiallyCompleted":
+                    raise RuntimeError(f"Batch job {job_id} {status}")
+                break
+            time.sleep(POLL_SECONDS)
+
+        out_path = BATCH_DIR / "output" / f"{job_id}.jsonl.out"
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        # Bedrock writes <output prefix>/<job id>/<input file name>.out
+        out_key = self._key("output", arn.rsplit("/", 1)[-1], f"{job_id}.jsonl.out")
+        self.s3.download_file(self.bucket, out_key, str(out_path))
+        return out_path
+
+
+def get_batch_service(tool: str):
+    if S3_URI and ROLE_ARN:
+        return S3BatchService(tool)
+    return LocalDirBatchService(tool)
+
+
+# === COLLECT ===
+def collect_results(out_path: Path) -> dict:
+    """recordId → generation text ("" for errored records)."""
+    results = {}
+    for row in _read_jsonl(out_path):
+        out = row.get("modelOutput") or {}
+        results[row["recordId"]] = (out.get("generation") or "").strip()
+    return results
+
+
+def run_batch(tool: str, records, max_tokens: int = 500, temperature: float = 0.7):
+    """
+    Spool → submit → wait → collect.
+    Returns generations aligned with `records` (list of (video_id, prompt)).
+    """
+    records = list(records)
+    if not records:
+        return []
+    job_id = spool_job(tool, records, max_tokens=max_tokens, temperature=temperature)
+    service = get_batch_service(tool)
+    service.submit(job_id)
+    results = collect_results(service.wait(job_id))
+    print(f"📥 Collected {len(results)} results for batch job {job_id}")
+    return [results.get(record_id(tool, video_id), "") for video_id, _ in records]
+
+
+def run_jobs(tool: str, backend, records, max_tokens: int = 500, batch: bool | None = None):
+    """
+    The tools' single entry point for generation: records are (video_id, prompt).
+    batch (default BATCH_MODE) → one spooled job for the whole catalog, results
+    folded back by record ID; otherwise backend.generate_batch().
+    Returns (generations aligned with records, model label for the output files).
+    """
+    records = list(records)
+    batch = BATCH_MODE if batch is None else batch
+    if batch:
+        outputs = run_batch(tool, records, max_tokens=max_tokens)
+    else:
+        outputs = backend.generate_batch([p for _, p in records], max_tokens=max_tokens)
+    return outputs, backend.label + (" (batch)" if batch else "")
@@ -0,0 +1,127 @@
+"""
+Persistent Bedrock response cache
+---------------------------------
+Content-addressed SQLite cache for LLM generations.
+Key = sha256(model_id, formatted prompt, max_gen_len, temperature).
+Evicts least-recently-used rows once the cache exceeds its size or age budget.
+"""
+
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+# === CONFIG ===
+BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_PATH = Path(os.getenv("BEDROCK_CACHE_PATH", BASE_DIR / "outputs" / "cache" / "bedrock.sqlite"))
+MAX_ENTRIES = int(os.getenv("BEDROCK_CACHE_MAX_ENTRIES", "20000"))
+MAX_BYTES = int(os.getenv("BEDROCK_CACHE_MAX_MB", "200")) * 1024 * 1024
+MAX_AGE_DAYS = float(os.getenv("BEDROCK_CACHE_MAX_AGE_DAYS", "30"))
+BYPASS = os.getenv("BEDROCK_CACHE_BYPASS", "0").lower() in ("1", "true", "yes")
+
+
+def make_key(model_id: str, formatted_prompt: str, max_gen_len: int, temperature: float,
+             mode: str = "full") -> str:
+    # "full" keeps the original key layout, so existing entries stay valid
+    parts = [model_id, formatted_prompt, int(max_gen_len), float(temperature)]
+    if mode != "full":
+        parts.append(mode)  # e.g. "stream-json": text may stop at the first JSON object
+    raw = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class BedrockCache:
+    def __init__(self, path: Path = CACHE_PATH, max_entries: int = MAX_ENTRIES,
+                 max_bytes: int = MAX_BYTES, max_age_days: float = MAX_AGE_DAYS):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    # --- lazy connection (shared across worker threads, guarded by _lock) ---
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS generations (
+                       key TEXT PRIMARY KEY,
+                       value TEXT NOT NULL,
+                       size INTEGER NOT NULL,
+                       created REAL NOT NULL,
+                       accessed REAL NOT NULL)"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON generations(accessed)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str):
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT value, created FROM generations WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or (self.max_age_s > 0 and now - row[1] > self.max_age_s):
+                self.misses += 1
+                return None
+            db.execute("UPDATE generations SET accessed = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str):
+        if not value:
+            return  # failed generations are never memoized
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO generations (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._evict(db, now)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        if self.max_age_s > 0:
+            cur = db.execute("DELETE FROM generations WHERE created < ?", (now - self.max_age_s,))
+            self.evictions += max(0, cur.rowcount)
+
+        count, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM generations").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # drop least-recently-used rows until both budgets are met
+        for key, size in db.execute("SELECT key, size FROM generations ORDER BY accessed ASC").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM generations WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM generations")
+            db.commit()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+# --- process-wide instance used by shared_bedrock ---
+cache = BedrockCache()
@@ -1,51 +1,162 @@
 import os
+import re
 import datetime as dt
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
+
+from googleapiclient.errors import HttpError
+
+from bc.tools.youtube_client import get_youtube, execute
+from bc.tools.uploads_index import index as uploads_index
+from bc.tools.candidate_scoring import score_catalog, top_k_indices
 
 load_dotenv()
 API_KEY = os.getenv("YT_API_KEY")
 
+STATS_WORKERS = int(os.getenv("YT_STATS_WORKERS", "8"))
+# partial response: only what _attach_stats reads
+STATS_FIELDS = "items(id,statistics(viewCount,commentCount),snippet/description)"
+
 # ---------- internal helpers ----------
 
 def _youtube():
-    if not API_KEY:
-        raise RuntimeError("YOUTUBE_API_KEY missing in .env")
-    return build("youtube", "v3", developerKey=API_KEY)
+    # shared thread-local client: static discovery doc parsed once, keep-alive HTTP
+    return get_youtube()
 
 
-def _channel_uploads_playlist_id(channel_id: str) -> str:
+_CHANNEL_ID = re.compile(r"UC[\w-]{22}")
+_HANDLE = re.compile(r"(?:^|youtube\.com/)(@[\w.\-]+)")
+
+
+def resolve_channel_id(ref: str) -> str:
+    """
+    Channel ID from a channel ID, a youtube.com/channel/UC… URL, an @handle or a
+    youtube.com/@handle URL. Only handles cost an API call (channels.list forHandle).
+    """
+    ref = ref.strip()
+    m = _CHANNEL_ID.search(ref)
+    if m:
+        return m.group(0)
+    m = _HANDLE.search(ref)
+    if not m:
+        raise ValueError(f"Not a channel ID, channel URL or @handle: {ref}")
+    r = execute(_youtube().channels().list(part="id", forHandle=m.group(1)), "channels.list")
+    items = r.get("items", [])
+    if not items:
+        raise ValueError(f"Channel not found: {ref}")
+    return items[0]["id"]
+
+
+def channel_overview(channel_id: str) -> dict:
+    """
+    Uploads playlist + public video count in one channels.list call. The playlist
+    is recorded in the uploads index, so the first sync doesn't look it up again.
+    """
     yt = _youtube()
-    r = yt.channels().list(part="contentDetails", id=channel_id).execute()
+    r = execute(yt.channels().list(part="contentDetails,statistics", id=channel_id), "channels.list")
     items = r.get("items", [])
     if not items:
         raise ValueError("Channel not found or contentDetails unavailable")
-    return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+    playlist_id = items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+    meta = uploads_index.get_channel(channel_id)
+    uploads_index.set_channel(channel_id, playlist_id, complete=bool(meta and meta["complete"]))
+    return {
+        "playlist_id": playlist_id,
+        "video_count": int(items[0].get("statistics", {}).get("videoCount", 0)),
+    }
+
 
+def _channel_uploads_playlist_id(channel_id: str) -> str:
+    return channel_overview(channel_id)["playlist_id"]
+
+
+def _playlist_item(it) -> dict:
+    cd = it["contentDetails"]
+    return {
+        "video_id": cd["videoId"],
+        "title": it["snippet"]["title"],
+        # scheduled/private items have no videoPublishedAt yet
+        "publishedAt": cd.get("videoPublishedAt") or it["snippet"].get("publishedAt", ""),
+    }
 
-def _list_all_uploads(playlist_id: str, max_pages: int = 200):
+
+def _list_all_uploads(playlist_id: str, max_pages: int = 200, known_ids=None, etag: str | None = None):
+    """
+    Pages through the uploads playlist (newest first).
+    - known_ids: stop after the first page that contains an already-indexed video.
+    - etag: sent as If-None-Match on the first page; a 304 means nothing changed.
+    Returns (items, first_page_etag, caught_up, not_modified) where caught_up means
+    the listing reached either the end of the playlist or an already-known video.
+    """
     yt = _youtube()
     token = None
     out = []
     pages = 0
+    first_etag = None
+    caught_up = False
     while True:
-        r = yt.playlistItems().list(
+        req = yt.playlistItems().list(
             part="contentDetails,snippet",
             playlistId=playlist_id,
             maxResults=50,
             pageToken=token
-        ).execute()
+        )
+        if pages == 0 and etag:
+            req.headers["If-None-Match"] = etag
+        try:
+            r = execute(req, "playlistItems.list")
+        except HttpError as e:
+            if pages == 0 and etag and getattr(e.resp, "status", None) == 304:
+                return [], etag, False, True
+            raise
+        if pages == 0:
+            first_etag = r.get("etag")
+
+        hit_known = False
         for it in r.get("items", []):
-            out.append({
-                "video_id": it["contentDetails"]["videoId"],
-                "title": it["snippet"]["title"],
-                "publishedAt": it["contentDetails"]["videoPublishedAt"],
-            })
+            v = _playlist_item(it)
+            if known_ids and v["video_id"] in known_ids:
+                hit_known = True
+                continue
+            out.append(v)
         token = r.get("nextPageToken")
         pages += 1
-        if not token or pages >= max_pages:
+        if not token or hit_known:
+            caught_up = True
+            break
+        if pages >= max_pages:
             break
-    return out
+    return out, first_etag, caught_up, False
+
+
+def _sync_uploads(channel_id: str, max_pages: int = 200) -> list:
+    """
+    Incremental sync of a channel's uploads into the local index; returns all
+    indexed uploads. After the first full listing, a run costs 1 call (304 / one
+    page of new videos) instead of up to `max_pages`.
+    """
+    meta = uploads_index.get_channel(channel_id)
+    playlist_id = meta["playlist_id"] if meta else _channel_uploads_playlist_id(channel_id)
+
+    incremental = bool(meta and meta["complete"])
+    known = uploads_index.known_ids(channel_id) if incremental else None
+    items, etag, caught_up, not_modified = _list_all_uploads(
+        playlist_id,
+        max_pages=max_pages,
+        known_ids=known,
+        etag=meta["etag"] if incremental else None,
+    )
+
+    if not_modified:
+        print("📇 Uploads index up to date (304 Not Modified).")
+    else:
+        uploads_index.upsert(channel_id, items)
+        print(f"📇 Indexed {len(items)} new uploads.")
+    # a listing cut off by max_pages leaves a gap → next run pages from the top again
+    uploads_index.set_channel(channel_id, playlist_id, etag=etag,
+                              complete=not_modified or caught_up)
+    return uploads_index.uploads(channel_id)
 
 
 def _iso_to_date(s: str) -> dt.date:
@@ -60,38 +171,60 @@ def _chunk(ids, n=50):
         yield ids[i:i+n]
 
 
-def _attach_stats(videos):
+def _fetch_stats_chunk(chunk):
+    # runs on a worker thread → thread-local client
+    req = _youtube().videos().list(
+        part="statistics,snippet",
+        id=",".join(chunk),
+        fields=STATS_FIELDS,
+        maxResults=50,
+    )
+    return execute(req, "videos.list")
+
+
+def _attach_stats(videos, workers: int = STATS_WORKERS):
     """
     Fetches viewCount, commentCount, and description for each video.
+    50-ID chunks are fetched concurrently on a bounded thread pool.
+    Videos that videos.list no longer returns (deleted / private) are dropped
+    and pruned from the uploads index, so they never score as 0-view candidates.
     """
-    yt = _youtube()
     id_to_video = {v["video_id"]: v for v in videos}
+    chunks = list(_chunk(list(id_to_video.keys()), 50))
+    if not chunks:
+        return []
 
-    for chunk in _chunk(list(id_to_video.keys()), 50):
-        # ✅ Pull both statistics and snippet parts
-        r = yt.videos().list(part="statistics,snippet", id=",".join(chunk)).execute()
-        for it in r.get("items", []):
-            v = id_to_video.get(it["id"])
-            stats = it.get("statistics", {})
-            snippet = it.get("snippet", {})
+    found = set()
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks))), thread_name_prefix="yt-stats") as pool:
+        for r in pool.map(_fetch_stats_chunk, chunks):
+            for it in r.get("items", []):
+                v = id_to_video.get(it["id"])
+                stats = it.get("statistics", {})
+                snippet = it.get("snippet", {})
 
-            if v is not None:
-                v["viewCount"] = int(stats.get("viewCount", 0))
-                v["commentCount"] = int(stats.get("commentCount", 0))
-                v["description"] = snippet.get("description", "").strip()  # ✅ Added field
+                if v is not None:
+                    found.add(it["id"])
+                    v["viewCount"] = int(stats.get("viewCount", 0))
+                    v["commentCount"] = int(stats.get("commentCount", 0))
+                    v["description"] = snippet.get("description", "").strip()  # ✅ Added field
 
-    return list(id_to_video.values())
+    gone = [vid for vid in id_to_video if vid not in found]
+    if gone:
+        uploads_index.remove(gone)
+        print(f"🧹 Pruned {len(gone)} deleted/private uploads from the index.")
+    return [v for vid, v in id_to_video.items() if vid in found]
 
 
 # ---------- public API ----------
 
-def select_backcatalog_candidates(channel_id: str, age_days_min: int = 180, pool_size: int = 100, limit: int = 5):
+def select_backcatalog_candidates(channel_id: str, age_days_min: int = 180, pool_size: int | None = None, limit: int = 5):
     """
     Dynamically selects top 'limit' back-catalog candidates older than 'age_days_min' days.
+    Every aged video is scored (vectorized); pass pool_size to cap the pool to the
+    oldest N videos before fetching stats.
     """
     print(f"🔎 Fetching videos older than {age_days_min} days...")
-    uploads_pl = _channel_uploads_playlist_id(channel_id)
-    uploads = _list_all_uploads(uploads_pl, max_pages=200)
+    uploads = _sync_uploads(channel_id, max_pages=200)
 
     today = dt.date.today()
     aged = []
@@ -109,37 +242,25 @@ def select_backcatalog_candidates(channel_id: str, age_days_min: int = 180, pool
         return []
 
     aged.sort(key=lambda x: x["age_days"], reverse=True)
-    pool = aged[:pool_size]
+    pool = aged[:pool_size] if pool_size else aged
     pool = _attach_stats(pool)
+    if not pool:
+        return []
 
-    vpd_vals = []
-    for v in pool:
-        views = v.get("viewCount", 0)
-        comments = v.get("commentCount", 0)
-        age_days = v["age_days"]
-        v["views_per_day"] = views / age_days
-        v["comments_per_1k"] = (comments / views * 1000) if views > 0 else 0.0
-        if v["views_per_day"] > 0:
-            vpd_vals.append(v["views_per_day"])
-
-    vpd_vals.sort()
-    median_vpd = vpd_vals[len(vpd_vals)//2] if vpd_vals else 0.0
-
-    def score(v):
-        age_score = min(1.0, v["age_days"] / 365.0)
-        under_vel = 1.0 if v["views_per_day"] < median_vpd else 0.3
-        engagement = min(1.0, v["comments_per_1k"] / 2.0)
-        return 0.4*age_score + 0.4*under_vel + 0.2*engagement
-
-    for v in pool:
-        v["selection_score"] = round(score(v), 3)
-
-    ranked = sorted(pool, key=lambda x: x["selection_score"], reverse=True)
-    top = ranked[:limit]
+    ages = np.fromiter((v["age_days"] for v in pool), dtype=np.float64, count=len(pool))
+    views = np.fromiter((v.get("viewCount", 0) for v in pool), dtype=np.float64, count=len(pool))
+    comments = np.fromiter((v.get("commentCount", 0) for v in pool), dtype=np.float64, count=len(pool))
+    scored = score_catalog(ages, views, comments)
 
-    for v in top:
+    top = []
+    for i in top_k_indices(scored["selection_score"], ages, limit):
+        v = pool[i]
+        v["views_per_day"] = float(scored["views_per_day"][i])
+        v["comments_per_1k"] = float(scored["comments_per_1k"][i])
+        v["selection_score"] = float(scored["selection_score"][i])
         v.pop("viewCount", None)
         v.pop("commentCount", None)
+        top.append(v)
 
-    print(f"🏁 Returning top {len(top)} ranked candidates.")
+    print(f"🏁 Returning top {len(top)} ranked candidates (scored {len(pool)}).")
     return top
@@ -6,7 +6,8 @@ Purpose: Rewrites YouTube descriptions for SEO and clarity.
 from pathlib import Path
 import json
 import re
-from bc.tools.shared_bedrock import generate_bedrock_response
+from bc.tools.llm_backends import get_backend_for
+from bc.tools import batch_spool
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -36,27 +37,8 @@ def extract_json_segment(text: str) -> str:
     return text
 
 
-def description_rewrite():
-    videos_file = ARTIFACTS / "videos.json"
-    if not videos_file.exists():
-        print(f"❌ No videos.json found at {videos_file}")
-        return
-
-    with open(videos_file, "r", encoding="utf-8") as f:
-        videos = json.load(f)
-
-    results = []
-    print("✍️ Starting description rewrite process...")
-
-    for vid in videos:
-        title = vid.get("title", "")
-        description = vid.get("description", "")
-        transcript = vid.get("first60_text", "")
-        if not description:
-            print(f"⚠️ Skipping {title} (no description found in metadata)")
-            continue
-
-        prompt = f"""
+def build_prompt(title: str, transcript: str, description: str) -> str:
+    return f"""
 You are a YouTube SEO strategist and copywriter.
 
 Task: Rewrite the following video description to improve discoverability,
@@ -86,7 +68,35 @@ Respond ONLY in valid JSON:
 Ensure JSON validity, no markdown, no commentary.
         """
 
-        raw_output = generate_bedrock_response(prompt, max_tokens=400)
+
+def description_rewrite(batch: bool | None = None):
+    videos_file = ARTIFACTS / "videos.json"
+    if not videos_file.exists():
+        print(f"❌ No videos.json found at {videos_file}")
+        return
+
+    with open(videos_file, "r", encoding="utf-8") as f:
+        videos = json.load(f)
+
+    print("✍️ Starting description rewrite process...")
+
+    jobs = []
+    for vid in videos:
+        title = vid.get("title", "")
+        description = vid.get("description", "")
+        transcript = vid.get("first60_text", "")
+        if not description:
+            print(f"⚠️ Skipping {title} (no description found in metadata)")
+            continue
+        jobs.append((vid, build_prompt(title, transcript, description)))
+
+    backend = get_backend_for("description")
+    outputs, model_label = batch_spool.run_jobs("description", backend, [(vid["video_id"], p) for vid, p in jobs],
+                                                max_tokens=400, batch=batch)
+
+    results = []
+    for (vid, _), raw_output in zip(jobs, outputs):
+        title = vid.get("title", "")
         cleaned = clean_text(raw_output)
         extracted = extract_json_segment(cleaned)
 
@@ -104,7 +114,7 @@ Ensure JSON validity, no markdown, no commentary.
             "title": title,
             "improved_description": parsed.get("improved_description", ""),
             "improvement_notes": parsed.get("improvement_notes", []),
-            "model": "AWS Bedrock – meta.llama3-8b-instruct-v1:0"
+            "model": model_label
         })
 
         print(f"✅ Rewritten description: {title}")
@@ -0,0 +1,152 @@
+"""
+Local fake YouTube Data API (benchmarks / offline runs)
+-------------------------------------------------------
+Serves deterministic channels.list, playlistItems.list and videos.list responses
+for a synthetic catalog with configurable per-request latency. Point the clients
+at it with YT_API_ENDPOINT=http://127.0.0.1:<port>/youtube/v3/.
+
+Benchmark _attach_stats serial vs. concurrent:
+    python -m bc.tools.fake_youtube_api --bench --videos 10000 --latency-ms 80
+"""
+
+import json
+import time
+import hashlib
+import argparse
+import datetime as dt
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+PAGE_SIZE = 50
+
+
+class FakeCatalog:
+    def __init__(self, n_videos: int = 1000, channel_id: str = "UCfake"):
+        self.channel_id = channel_id
+        self.playlist_id = "UU" + channel_id[2:]
+        today = dt.date.today()
+        # newest first, one upload every ~2 days
+        self.videos = [
+            {
+                "video_id": f"vid{i:07d}",
+                "title": f"Fake video {i}",
+                "publishedAt": (today - dt.timedelta(days=2 * i + 1)).isoformat() + "T12:00:00Z",
+                "viewCount": (i * 7919) % 500000,
+                "commentCount": (i * 104729) % 2000,
+            }
+            for i in range(n_videos)
+        ]
+        self.by_id = {v["video_id"]: v for v in self.videos}
+
+    def etag(self, payload) -> str:
+        return hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _make_handler(catalog: FakeCatalog, latency_ms: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: dict | None = None, etag: str | None = None):
+            data = json.dumps(body).encode() if body is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if latency_ms:
+                time.sleep(latency_ms / 1000.0)
+            url = urlparse(self.path)
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+            endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+
+            if endpoint == "channels":
+                body = {"items": [{"id": catalog.channel_id,
+                                   "contentDetails": {"relatedPlaylists": {"uploads": catalog.playlist_id}}}]}
+                return self._send(200, body)
+
+            if endpoint == "playlistItems":
+                start = int(q.get("pageToken") or 0)
+                page = catalog.videos[start:start + PAGE_SIZE]
+                body = {"items": [
+                    {"contentDetails": {"videoId": v["video_id"], "videoPublishedAt": v["publishedAt"]},
+                     "snippet": {"title": v["title"], "publishedAt": v["publishedAt"]}}
+                    for v in page
+                ]}
+                if start + PAGE_SIZE < len(catalog.videos):
+                    body["nextPageToken"] = str(start + PAGE_SIZE)
+                body["etag"] = catalog.etag(body)
+                if self.headers.get("If-None-Match") == body["etag"]:
+                    return self._send(304, None, etag=body["etag"])
+                return self._send(200, body, etag=body["etag"])
+
+            if endpoint == "videos":
+                ids = [i for i in q.get("id", "").split(",") if i]
+                body = {"items": [
+                    {"id": vid,
+                     "statistics": {"viewCount": str(catalog.by_id[vid]["viewCount"]),
+                                    "commentCount": str(catalog.by_id[vid]["commentCount"])},
+                     "snippet": {"description": f"Description of {vid}"}}
+                    for vid in ids if vid in catalog.by_id
+                ]}
+                return self._send(200, body)
+
+            self._send(404, {"error": {"code": 404, "message": f"unknown endpoint {endpoint}"}})
+
+    return Handler
+
+
+def serve(n_videos: int = 1000, latency_ms: float = 0.0, port: int = 0):
+    """Starts the fake API on a daemon thread. Returns (server, base_url, catalog)."""
+    catalog = FakeCatalog(n_videos)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(catalog, latency_ms))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/youtube/v3/"
+    return server, base_url, catalog
+
+
+def _bench_attach_stats(n_videos: int = 10000, latency_ms: float = 80.0, workers=(1, 4, 8, 16)):
+    server, base_url, catalog = serve(n_videos, latency_ms)
+
+    from bc.tools import youtube_client
+    youtube_client.API_ENDPOINT = base_url
+    youtube_client.API_KEY = youtube_client.API_KEY or "fake-key"
+    from bc.tools.candidate_selector import _attach_stats
+
+    print(f"fake API at {base_url} | {n_videos} videos | {latency_ms} ms/request")
+    for w in workers:
+        vids = [{"video_id": v["video_id"]} for v in catalog.videos]
+        t0 = time.perf_counter()
+        out = _attach_stats(vids, workers=w)
+        wall = time.perf_counter() - t0
+        ok = sum(1 for v in out if "viewCount" in v)
+        print(f"workers={w:>2} | {wall:6.2f}s | {ok}/{len(out)} videos with stats")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake YouTube Data API")
+    parser.add_argument("--videos", type=int, default=10000)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--bench", action="store_true", help="Benchmark _attach_stats against the fake API")
+    args = parser.parse_args()
+
+    if args.bench:
+        _bench_attach_stats(args.videos, args.latency_ms)
+    else:
+        srv, url, _ = serve(args.videos, args.latency_ms, args.port)
+        print(f"🧪 Fake YouTube API serving {args.videos} videos at {url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            srv.shutdown()
@@ -1,8 +1,17 @@
 import os
 import re
 import json
+import time
+import heapq
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
 from pathlib import Path
 
+import numpy as np
+
+from bc.tools.transcript_store import store
+from bc.tools.uploads_index import index as uploads_index
+
 ARTIFACTS_PATH = "bc/outputs/artifacts/videos.json"
 TRANSCRIPTS_DIR = "bc/outputs/transcripts"
 ANALYSIS_DIR = "bc/outputs/analysis"
@@ -22,7 +31,7 @@ def _clean_text(t: str) -> str:
 
 def _first_chunk(text: str, target_chars: int = 900) -> str:
     """
-    We don't have exact timestamps in the .txt, so approximate ~60s by characters.
+    Legacy .txt transcripts have no timestamps, so approximate ~60s by characters.
     Whisper base at normal speech ~12–15 chars/sec ≈ 720–900 chars/min.
     """
     if not text:
@@ -30,6 +39,98 @@ def _first_chunk(text: str, target_chars: int = 900) -> str:
     text = _clean_text(text)
     return text[:target_chars]
 
+# === Lexicons (distinct phrases present, substring match on lowercased text) ===
+CURIOSITY_KW = [
+    "what happens", "what if", "why", "how", "can you", "mystery",
+    "surprising", "counterintuitive", "secret", "we discovered",
+    "we tested", "we tried", "you won't believe", "unexpected"
+]
+STAKES_KW = [
+    "danger", "risk", "cost", "fail", "impossible", "problem",
+    "fix", "solution", "proof", "evidence", "real", "myth"
+]
+WEAK_KW = ["in this video", "today we're", "welcome back", "hey guys", "like and subscribe"]
+
+FEATURES = [
+    "curiosity_hits", "stakes_hits", "specificity_hits", "questions",
+    "proper_nouns", "exclaims", "weak_openers", "words",
+]
+_CATEGORIES = {"curiosity_hits": CURIOSITY_KW, "stakes_hits": STAKES_KW, "weak_openers": WEAK_KW}
+
+
+def _trie_regex(phrases) -> str:
+    """Alternation factored into a trie (shared prefixes matched once, longest first)."""
+    trie = {}
+    for p in phrases:
+        node = trie
+        for ch in p:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+def _compile_lexicon():
+    phrases = sorted({p for kws in _CATEGORIES.values() for p in kws})
+    # zero-width lookahead → a match can start at every position, so overlapping
+    # phrases are all seen; the capture is the longest phrase starting there
+    matcher = re.compile("(?=(" + _trie_regex(phrases) + "))")
+    # a captured phrase also implies every shorter lexicon phrase that prefixes it
+    implied = {p: [q for q in phrases if p.startswith(q)] for p in phrases}
+    category_of = {}
+    for name, kws in _CATEGORIES.items():
+        for p in kws:
+            category_of.setdefault(p, []).append(name)
+    return matcher, implied, category_of
+
+
+_LEXICON, _IMPLIED, _CATEGORY_OF = _compile_lexicon()
+# numbers and proper nouns in one scan (group 1 = number); ? and ! via str.count
+_TOKENS = re.compile(r"\b(?:(\d+(?:\.\d+)?)|[A-Z][a-z]{3,})\b")
+
+# weights / normalisation caps (clip01(x, 0, cap)); weak openers are an inverted penalty
+_WEIGHTS = {"curiosity_hits": (0.22, 4), "stakes_hits": (0.20, 4), "specificity_hits": (0.18, 6),
+            "questions": (0.12, 3), "proper_nouns": (0.10, 10), "exclaims": (0.05, 2)}
+_WEAK_WEIGHT, _WEAK_CAP = 0.08, 2
+RAMBLING_WORDS = 220  # ~ >60s worth of dense talk for first chunk
+
+
+_COL = {name: j for j, name in enumerate(FEATURES)}
+_PHRASE_COLS = {p: [_COL[name] for name in names] for p, names in _CATEGORY_OF.items()}
+_NUM_COL, _PROPER_COL = _COL["specificity_hits"], _COL["proper_nouns"]
+_Q_COL, _EX_COL, _WORDS_COL = _COL["questions"], _COL["exclaims"], _COL["words"]
+
+
+def _feature_row(text: str) -> list:
+    """Raw feature counts in FEATURES order: one lexicon scan + one token scan."""
+    row = [0] * len(FEATURES)
+    seen = set()
+    for phrase in set(_LEXICON.findall(text.lower())):
+        seen.update(_IMPLIED[phrase])
+    for phrase in seen:
+        for j in _PHRASE_COLS[phrase]:
+            row[j] += 1
+    tokens = _TOKENS.findall(text)
+    numbers = len(tokens) - tokens.count("")
+    row[_NUM_COL] = numbers
+    row[_PROPER_COL] = len(tokens) - numbers
+    row[_Q_COL] = text.count("?")
+    row[_EX_COL] = text.count("!")
+    row[_WORDS_COL] = len(text.split())
+    return row
+
+
+def _features(text: str) -> dict:
+    return dict(zip(FEATURES, _feature_row(text)))
+
+
 def _score_hook(text: str) -> dict:
     """
     Very light, explainable heuristic to get us started.
@@ -39,29 +140,8 @@ def _score_hook(text: str) -> dict:
     if not text:
         return {"score": 0.0, "notes": ["no transcript"], "factors": {}}
 
-    # Signals
-    curiosity_kw = [
-        "what happens", "what if", "why", "how", "can you", "mystery",
-        "surprising", "counterintuitive", "secret", "we discovered",
-        "we tested", "we tried", "you won't believe", "unexpected"
-    ]
-    stakes_kw = [
-        "danger", "risk", "cost", "fail", "impossible", "problem",
-        "fix", "solution", "proof", "evidence", "real", "myth"
-    ]
-    specificity_hits = len(re.findall(r"\b\d+(\.\d+)?\b", text))  # numbers = specificity
-    questions = text.count("?")
-    uppercase_proper = len(re.findall(r"\b[A-Z][a-z]{3,}\b", text))  # rough proper nouns
-    exclaim = text.count("!")
-    # filler / weak openers
-    weak_kw = ["in this video", "today we're", "welcome back", "hey guys", "like and subscribe"]
-    weak_hits = sum(1 for w in weak_kw if w in text.lower())
-    # curiosity/stakes density
-    cur_hits = sum(1 for w in curiosity_kw if w in text.lower())
-    stk_hits = sum(1 for w in stakes_kw if w in text.lower())
-    # length / pacing proxy
-    words = len(text.split())
-    long_rambling = words > 220  # ~ >60s worth of dense talk for first chunk
+    f = _features(text)
+    long_rambling = f["words"] > RAMBLING_WORDS
 
     # normalize features to 0..1 rough scale
     def clip01(x, lo, hi):
@@ -69,13 +149,13 @@ def _score_hook(text: str) -> dict:
             return 0.0
         return max(0.0, min(1.0, (x - lo) / (hi - lo)))
 
-    f_curiosity = clip01(cur_hits, 0, 4)
-    f_stakes    = clip01(stk_hits, 0, 4)
-    f_specific  = clip01(specificity_hits, 0, 6)
-    f_questions = clip01(questions, 0, 3)
-    f_proper    = clip01(uppercase_proper, 0, 10)
-    f_exclaim   = clip01(exclaim, 0, 2)
-    f_weakpen   = 1.0 - clip01(weak_hits, 0, 2)  # penalty inverted
+    f_curiosity = clip01(f["curiosity_hits"], 0, 4)
+    f_stakes    = clip01(f["stakes_hits"], 0, 4)
+    f_specific  = clip01(f["specificity_hits"], 0, 6)
+    f_questions = clip01(f["questions"], 0, 3)
+    f_proper    = clip01(f["proper_nouns"], 0, 10)
+    f_exclaim   = clip01(f["exclaims"], 0, 2)
+    f_weakpen   = 1.0 - clip01(f["weak_openers"], 0, 2)  # penalty inverted
     f_pacing    = 0.6 if long_rambling else 1.0  # very rough pacing penalty
 
     # weighted sum
@@ -90,33 +170,173 @@ def _score_hook(text: str) -> dict:
     ) * f_pacing
 
     # notes
-    if cur_hits == 0: notes.append("add a curiosity hook (why/how/what if)")
-    if stk_hits == 0: notes.append("add stakes or tension (risk/cost/benefit)")
-    if specificity_hits == 0: notes.append("add specific facts or numbers early")
-    if questions == 0: notes.append("ask a pointed question to create pull")
-    if weak_hits > 0: notes.append("avoid generic openers (“in this video…”)")
+    if f["curiosity_hits"] == 0: notes.append("add a curiosity hook (why/how/what if)")
+    if f["stakes_hits"] == 0: notes.append("add stakes or tension (risk/cost/benefit)")
+    if f["specificity_hits"] == 0: notes.append("add specific facts or numbers early")
+    if f["questions"] == 0: notes.append("ask a pointed question to create pull")
+    if f["weak_openers"] > 0: notes.append("avoid generic openers (“in this video…”)")
     if long_rambling: notes.append("tighten pacing; front-load payoff within ~20s")
 
     return {
         "score": round(float(score), 3),
         "notes": notes,
-        "factors": {
-            "curiosity_hits": cur_hits,
-            "stakes_hits": stk_hits,
-            "specificity_hits": specificity_hits,
-            "questions": questions,
-            "proper_nouns": uppercase_proper,
-            "exclaims": exclaim,
-            "weak_openers": weak_hits,
-            "words": words
-        }
+        "factors": f
+    }
+
+
+def score_hooks_batch(texts) -> dict:
+    """
+    Vectorized scoring for many hooks at once.
+    Returns {"features": (n, len(FEATURES)) float64 matrix of raw counts,
+             "columns": FEATURES, "scores": (n,) array} — scores equal _score_hook's.
+    """
+    texts = list(texts)
+    empty = [0] * len(FEATURES)
+    X = np.array([_feature_row(t) if t else empty for t in texts], dtype=np.float64).reshape(-1, len(FEATURES))
+    raw = _score_matrix(X)
+    raw[[not t for t in texts]] = 0.0
+    return {"features": X, "columns": FEATURES, "scores": np.round(raw, 3)}
+
+
+def _score_matrix(X: np.ndarray) -> np.ndarray:
+    """_score_hook's weighted sum over rows of raw counts (FEATURES order)."""
+    col = {name: X[:, j] for j, name in enumerate(FEATURES)}
+    raw = np.zeros(len(X), dtype=np.float64)
+    for name, (w, cap) in _WEIGHTS.items():
+        raw = raw + w * np.minimum(1.0, col[name] / cap)
+    raw = raw + _WEAK_WEIGHT * (1.0 - np.minimum(1.0, col["weak_openers"] / _WEAK_CAP))
+    return raw * np.where(col["words"] > RAMBLING_WORDS, 0.6, 1.0)
+
+
+# === Sliding-window heatmap (where in the hook does the energy drop?) ===
+HEATMAP_SPAN_S = float(os.getenv("HOOK_HEATMAP_SPAN_S", "90"))
+HEATMAP_WINDOW_S = float(os.getenv("HOOK_HEATMAP_WINDOW_S", "10"))
+HEATMAP_STEP_S = float(os.getenv("HOOK_HEATMAP_STEP_S", "5"))
+_REFERENCE_S = 60.0  # the caps in _WEIGHTS are calibrated for a ~60s hook
+
+
+def _cumulative(times: np.ndarray, rate: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """sum_i rate_i * max(0, t - times_i) for every t, via prefix sums over sorted times."""
+    order = np.argsort(times, kind="stable")
+    times, rate = times[order], rate[order]
+    a = np.vstack([np.zeros((1, rate.shape[1])), np.cumsum(rate, axis=0)])
+    b = np.vstack([np.zeros((1, rate.shape[1])), np.cumsum(rate * times[:, None], axis=0)])
+    n = np.searchsorted(times, t, side="right")
+    return t[:, None] * a[n] - b[n]
+
+
+def hook_heatmap(
+    rows: list,
+    text: str,
+    span_s: float = HEATMAP_SPAN_S,
+    window_s: float = HEATMAP_WINDOW_S,
+    step_s: float = HEATMAP_STEP_S
+) -> dict | None:
+    """
+    Scores every `window_s` window (every `step_s`, over the first `span_s`) of a
+    timed transcript. rows are store segments [start, end, char_start, char_end].
+
+    Each segment is featurized once and its counts are spread evenly over its
+    duration, so a window gets the share of every segment it overlaps in time
+    (Whisper segments are often longer than the step). The cumulative count at
+    time t is piecewise linear, F(t) = Σ c_i·(min(t, end_i) − start_i)/dur_i, and
+    is evaluated from prefix sums over segment starts and ends; window counts are
+    F(t + window_s) − F(t), so all windows together cost O((segments + windows)
+    log segments). Counts are scaled to the 60s reference so window scores share
+    the hook_score scale (lexicon phrases count per segment occurrence here, not
+    distinct per hook).
+    """
+    if not rows:
+        return None
+    starts = np.array([r[0] for r in rows], dtype=np.float64)
+    ends = np.maximum(np.array([r[1] for r in rows], dtype=np.float64), starts + 0.01)  # zero-length → step
+    seg = np.array([_feature_row(text[r[2]:r[3]]) for r in rows], dtype=np.float64)
+    rate = seg / (ends - starts)[:, None]
+
+    horizon = min(span_s, max(float(ends.max()), float(starts[-1]) + step_s))
+    t = np.arange(0.0, max(horizon - window_s, 0.0) + 1e-9, step_s)
+    bounds = np.concatenate([t, t + window_s])
+    F = _cumulative(starts, rate, bounds) - _cumulative(ends, rate, bounds)
+    counts = F[len(t):] - F[:len(t)]
+
+    # a window is silent (music bed, gap) only if no segment overlaps it at all
+    overlapping = (np.searchsorted(np.sort(starts), t + window_s, side="left")
+                   - np.searchsorted(np.sort(ends), t, side="right"))
+    scores = _score_matrix(counts * (_REFERENCE_S / window_s))
+    scores[overlapping <= 0] = 0.0
+    scores = np.round(scores, 3)
+
+    k = int(np.argmin(scores))
+    lo, hi = t[k], t[k] + window_s
+    inside = [r for r, s0, e0 in zip(rows, starts, ends) if s0 < hi and e0 > lo]
+    return {
+        "curve": {"step_s": step_s, "window_s": window_s, "scores": scores.tolist()},
+        "weak_span": {
+            "start_s": round(float(lo), 2),
+            "end_s": round(float(hi), 2),
+            "score": float(scores[k]),
+            "text": text[inside[0][2]:inside[-1][3]] if inside else "",
+        },
     }
 
+
+def weak_span(video_id: str, within_s: float, context_segments: int = 0) -> dict | None:
+    """
+    Weakest heatmap window that lies entirely inside the first `within_s` seconds.
+    With context_segments > 0 the result also carries "before"/"after": the text of
+    up to that many store segments on either side of the span (within the window).
+    """
+    timed = store.first_segments(video_id, within_s)
+    if not timed:
+        return None
+    rows, text = timed
+    heatmap = hook_heatmap(rows, text, span_s=within_s)
+    if not heatmap:
+        return None
+    span = heatmap["weak_span"]
+    if context_segments > 0 and span["text"]:
+        lo = text.find(span["text"])
+        hi = lo + len(span["text"])
+        before = [r for r in rows if r[3] <= lo][-context_segments:]
+        after = [r for r in rows if r[2] >= hi][:context_segments]
+        span["before"] = text[before[0][2]:before[-1][3]] if before else ""
+        span["after"] = text[after[0][2]:after[-1][3]] if after else ""
+    return span
+
+
+def _hook_text(vid: str, transcripts_dir: str, target_seconds: float, target_chars: int) -> str:
+    # exact first `target_seconds` from the segment store (already cleaned);
+    # fall back to a character cut for legacy .txt transcripts
+    chunk = store.first_seconds(vid, target_seconds)
+    if chunk is None:
+        text = _read_txt(Path(transcripts_dir) / f"{vid}.txt")
+        chunk = _first_chunk(text, target_chars=target_chars)
+    return chunk
+
+
+def _hook_record(vid: str, title, chunk: str) -> dict:
+    hook = _score_hook(chunk)
+    # timed transcripts only; legacy .txt has no timestamps to slide over
+    timed = store.first_segments(vid, HEATMAP_SPAN_S)
+    heatmap = hook_heatmap(*timed) if timed else None
+    return {
+        "video_id": vid,
+        "title": title,
+        "hook_score": hook["score"],
+        "hook_notes": hook["notes"],
+        "hook_factors": hook["factors"],
+        "hook_curve": heatmap["curve"] if heatmap else None,
+        "weak_span": heatmap["weak_span"] if heatmap else None,
+        "first60_text": chunk if chunk else None
+    }
+
+
 def analyze_hooks(
     artifacts_path: str = ARTIFACTS_PATH,
     transcripts_dir: str = TRANSCRIPTS_DIR,
     out_path: str = HOOKS_OUT,
-    target_chars: int = 900
+    target_chars: int = 900,
+    target_seconds: float = 60.0
 ):
     # ensure dirs
     Path(ANALYSIS_DIR).mkdir(parents=True, exist_ok=True)
@@ -129,20 +349,8 @@ def analyze_hooks(
     for v in videos:
         vid = v.get("video_id")
         title = v.get("title")
-        tpath = Path(transcripts_dir) / f"{vid}.txt"
-
-        text = _read_txt(tpath)
-        chunk = _first_chunk(text, target_chars=target_chars)
-        hook = _score_hook(chunk)
-
-        results.append({
-            "video_id": vid,
-            "title": title,
-            "hook_score": hook["score"],
-            "hook_notes": hook["notes"],
-            "hook_factors": hook["factors"],
-            "first60_text": chunk if chunk else None
-        })
+        chunk = _hook_text(vid, transcripts_dir, target_seconds, target_chars)
+        results.append(_hook_record(vid, title, chunk))
 
     # sort by hook score (desc)
     results.sort(key=lambda x: x["hook_score"], reverse=True)
@@ -155,3 +363,149 @@ def analyze_hooks(
     # print quick summary
     for r in results[:3]:
         print(f"- {r['title']} | hook_score={r['hook_score']} | notes: {', '.join(r['hook_notes'][:2]) or '—'}")
+        if r["weak_span"]:
+            w = r["weak_span"]
+            print(f"    weakest {w['start_s']:.0f}–{w['end_s']:.0f}s (score {w['score']}) | curve {_sparkline(r['hook_curve']['scores'])}")
+
+
+def _sparkline(scores: list) -> str:
+    bars = "▁▂▃▄▅▆▇█"
+    return "".join(bars[min(len(bars) - 1, int(s * len(bars)))] for s in scores)
+
+
+# === Catalog-wide mode (process pool, streaming) ===
+CATALOG_WORKERS = int(os.getenv("HOOK_WORKERS", str(os.cpu_count() or 2)))
+CATALOG_CHUNK = int(os.getenv("HOOK_CHUNK", "64"))  # video_ids per task (amortizes IPC)
+HOOKS_JSONL = os.path.join(ANALYSIS_DIR, "hooks.jsonl")
+
+
+def iter_catalog_ids(transcripts_dir: str = TRANSCRIPTS_DIR):
+    """Every video with a transcript: the store index, then legacy .txt files not in it."""
+    yield from store.iter_video_ids()
+    with os.scandir(transcripts_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".txt"):
+                vid = entry.name[:-4]
+                if store.lookup(vid, count=False) is None:
+                    yield vid
+
+
+def _init_catalog_worker():
+    # SQLite handles must not cross fork()
+    store.after_fork()
+    uploads_index.after_fork()
+
+
+def _analyze_chunk(vids, transcripts_dir, target_seconds, target_chars) -> list:
+    return [
+        _hook_record(vid, uploads_index.title(vid), _hook_text(vid, transcripts_dir, target_seconds, target_chars))
+        for vid in vids
+    ]
+
+
+def _chunks(it, n: int):
+    buf = []
+    for x in it:
+        buf.append(x)
+        if len(buf) == n:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def analyze_catalog(
+    transcripts_dir: str = TRANSCRIPTS_DIR,
+    workers: int = CATALOG_WORKERS,
+    chunk: int = CATALOG_CHUNK,
+    target_seconds: float = 60.0,
+    target_chars: int = 900
+):
+    """
+    Generator of hook records for every transcript in the catalog (completion order).
+    At most 2 × workers chunks are in flight, so memory stays flat however large
+    the catalog is.
+    """
+    window = max(1, workers) * 2
+    ids = _chunks(iter_catalog_ids(transcripts_dir), chunk)
+    with ProcessPoolExecutor(max_workers=max(1, workers), initializer=_init_catalog_worker) as pool:
+        pending = set()
+        for vids in ids:
+            pending.add(pool.submit(_analyze_chunk, vids, transcripts_dir, target_seconds, target_chars))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield from fut.result()
+        for fut in as_completed(pending):
+            yield from fut.result()
+
+
+def analyze_hooks_catalog(
+    transcripts_dir: str = TRANSCRIPTS_DIR,
+    out_path: str = HOOKS_JSONL,
+    workers: int = CATALOG_WORKERS,
+    top_k: int = 3,
+    target_seconds: float = 60.0
+):
+    """Streams analyze_catalog() into JSONL; only a bounded top-k heap is kept for the summary."""
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    best, weakest = [], []  # min-heaps of (score, seq, title/id)
+    n = 0
+    t0 = time.perf_counter()
+    with open(out_path, "w", encoding="utf-8") as f:
+        for r in analyze_catalog(transcripts_dir, workers=workers, target_seconds=target_seconds):
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            n += 1
+            label = (r["title"] or r["video_id"], ", ".join(r["hook_notes"][:2]) or "—")
+            item = (r["hook_score"], n, label)
+            (heapq.heappush if len(best) < top_k else heapq.heappushpop)(best, item)
+            (heapq.heappush if len(weakest) < top_k else heapq.heappushpop)(weakest, (-item[0], n, label))
+
+    wall = time.perf_counter() - t0
+    print(f"✅ Hook analysis for {n:,} transcripts saved → {out_path} ({wall:.1f}s, {workers} workers)")
+    for score, _, (title, notes) in sorted(best, reverse=True):
+        print(f"- {title} | hook_score={score} | notes: {notes}")
+    if weakest:
+        print("Weakest hooks:")
+        for neg, _, (title, notes) in sorted(weakest, reverse=True):
+            print(f"- {title} | hook_score={-neg} | notes: {notes}")
+    return n
+
+
+# ------ quick benchmark: per-text scorer vs. batch ------
+def _bench(n: int = 100_000):
+    import random
+    rng = random.Random(0)
+    vocab = ("so today we tested what happens when 12 people try the Impossible Challenge "
+             "why does it fail how much does it cost real proof hey guys welcome back "
+             "the secret nobody tells you is 3.5 times bigger than London or Paris ! ?").split()
+    texts = [" ".join(rng.choice(vocab) for _ in range(rng.randint(120, 180))) for _ in range(n)]
+
+    t0 = time.perf_counter()
+    out = score_hooks_batch(texts)
+    batch_s = time.perf_counter() - t0
+
+    sample = texts[:2000]
+    t0 = time.perf_counter()
+    single = [_score_hook(t)["score"] for t in sample]
+    single_s = (time.perf_counter() - t0) * n / len(sample)
+
+    same = all(abs(a - b) < 1e-9 for a, b in zip(single, out["scores"][:len(sample)]))
+    print(f"score_hooks_batch: {n:,} hooks in {batch_s:.2f}s → {n / batch_s * 60:,.0f}/min | "
+          f"_score_hook (extrapolated) {single_s:.2f}s | scores identical: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hook analysis")
+    parser.add_argument("--catalog", action="store_true",
+                        help="Analyze every transcript in the store → hooks.jsonl (process pool, streaming)")
+    parser.add_argument("--workers", type=int, default=CATALOG_WORKERS)
+    parser.add_argument("--top-k", type=int, default=3, help="Strongest/weakest hooks to print")
+    parser.add_argument("--bench", action="store_true", help="Benchmark score_hooks_batch")
+    args = parser.parse_args()
+    if args.bench:
+        _bench()
+    elif args.catalog:
+        analyze_hooks_catalog(workers=args.workers, top_k=args.top_k)
+    else:
+        analyze_hooks()
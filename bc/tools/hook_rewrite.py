@@ -1,13 +1,16 @@
 """
 Tool: hook_rewrite.py
-Purpose: Rewrites the hook zone (first 60–90s transcript) using AWS Bedrock.
+Purpose: Rewrites the hook zone (first 60–90s transcript) using the configured LLM backend.
 Structured output enforced (JSON schema) for consistent downstream reporting.
 """
 
 from pathlib import Path
+import os
 import json
 import re
-from bc.tools.shared_bedrock import generate_bedrock_response
+from bc.tools.llm_backends import get_backend_for
+from bc.tools import batch_spool
+from bc.tools.hook_analyzer import weak_span
 
 
 # === PATHS ===
@@ -15,6 +18,14 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 ARTIFACTS = BASE_DIR / "outputs" / "artifacts"
 OUT_PATH = BASE_DIR / "outputs" / "suggestions"
 OUT_PATH.mkdir(parents=True, exist_ok=True)
+# full → rewrite the whole hook zone; span → rewrite only its weakest heatmap window
+# (shorter generations) and splice it back into the hook
+REWRITE_SCOPE = os.getenv("HOOK_REWRITE_SCOPE", "full").lower()
+# first60_text covers this many seconds; spans outside it can't be spliced back
+REWRITE_WINDOW_S = float(os.getenv("TRANSCRIPT_FIRST_SECONDS", "60"))
+# span prompts only carry this many store segments on either side as context
+SPAN_CONTEXT_SEGMENTS = int(os.getenv("HOOK_REWRITE_CONTEXT_SEGMENTS", "1"))
+FULL_MAX_TOKENS = 300
 
 # --- Clean previous outputs ---
 for file in OUT_PATH.glob("*"):  # or SUGGESTIONS.glob("*")
@@ -33,28 +44,9 @@ def clean_text(txt: str) -> str:
     return txt.strip()
 
 
-# === HOOK REWRITE LOGIC ===
-def hook_rewrite():
-    videos_file = ARTIFACTS / "videos.json"
-    if not videos_file.exists():
-        print(f"❌ No videos.json found at {videos_file}")
-        return
-
-    with open(videos_file, "r", encoding="utf-8") as f:
-        videos = json.load(f)
-
-    rewrites = []
-    print("✍️ Starting hook rewrite process...")
-
-    for vid in videos:
-        title = vid.get("title", "")
-        transcript = vid.get("first60_text", "")
-        if not transcript:
-            print(f"⚠️ Skipping {title} (no transcript)")
-            continue
-
-        # ---------- Structured Prompt ----------
-        prompt = f"""
+# --- Helper: prompt ---
+def build_prompt(title: str, transcript: str) -> str:
+    return f"""
 You are a professional YouTube script editor specialized in audience retention.
 
 Task:
@@ -80,8 +72,102 @@ Respond ONLY in this JSON format:
 }}
         """
 
-        # ---------- Model Inference ----------
-        raw_output = generate_bedrock_response(prompt, max_tokens=300)
+
+def build_span_prompt(title: str, before: str, span_text: str, after: str, start_s: float, end_s: float) -> str:
+    return f"""
+You are a professional YouTube script editor specialized in audience retention.
+
+Task:
+The hook of this video loses energy between {start_s:.0f}s and {end_s:.0f}s. Rewrite ONLY that span
+so it keeps curiosity and stakes high and flows naturally from the text before it into the text after it.
+The rest of the hook stays as it is.
+
+Guidelines:
+- Keep it conversational and about the same length (under 60 words).
+- Add a concrete fact, question, or tension point.
+- Return ONLY JSON — no explanations.
+
+Video Title: {title}
+Text before (context only, do not rewrite): {before or "(start of video)"}
+Weak span to rewrite: {span_text}
+Text after (context only, do not rewrite): {after or "(end of hook)"}
+
+Respond ONLY in this JSON format:
+{{
+  "rewritten_script": "Your improved span only",
+  "style_notes": [
+    "Short note 1",
+    "Short note 2"
+  ]
+}}
+        """
+
+
+def _weak_span_for(vid: dict, transcript: str) -> dict | None:
+    """
+    Weakest window inside the rewrite window, computed from the current transcript
+    store (not a possibly stale hooks.json). None → rewrite the full hook: scope is
+    full, the transcript is untimed, or the span isn't part of this first60_text.
+    """
+    if REWRITE_SCOPE != "span":
+        return None
+    span = weak_span(vid["video_id"], REWRITE_WINDOW_S, context_segments=SPAN_CONTEXT_SEGMENTS)
+    if not span or not span["text"] or span["text"] not in transcript:
+        return None
+    return span
+
+
+def _span_max_tokens(span_text: str) -> int:
+    """Output budget for a span rewrite: ~3x the span's tokens (≈4 chars each) plus JSON/notes overhead."""
+    return min(FULL_MAX_TOKENS, 80 + 3 * (len(span_text) // 4 + 1))
+
+
+# === HOOK REWRITE LOGIC ===
+def hook_rewrite(batch: bool | None = None):
+    videos_file = ARTIFACTS / "videos.json"
+    if not videos_file.exists():
+        print(f"❌ No videos.json found at {videos_file}")
+        return
+
+    with open(videos_file, "r", encoding="utf-8") as f:
+        videos = json.load(f)
+
+    print("✍️ Starting hook rewrite process...")
+
+    # ---------- Structured Prompts ----------
+    jobs = []
+    for vid in videos:
+        title = vid.get("title", "")
+        transcript = vid.get("first60_text", "")
+        if not transcript:
+            print(f"⚠️ Skipping {title} (no transcript)")
+            continue
+        span = _weak_span_for(vid, transcript)
+        if span:
+            prompt = build_span_prompt(title, span.get("before", ""), span["text"], span.get("after", ""),
+                                       span["start_s"], span["end_s"])
+            jobs.append((vid, span, prompt))
+        else:
+            jobs.append((vid, None, build_prompt(title, transcript)))
+
+    # ---------- Model Inference (concurrent, input order preserved) ----------
+    # span and full jobs run as separate groups so span rewrites get a budget sized
+    # to their spans (windows are a fixed length, so one cap per group is enough)
+    backend = get_backend_for("rewrite")
+    outputs, model_label = [None] * len(jobs), backend.label
+    groups = {}
+    for i, (_, span, _) in enumerate(jobs):
+        groups.setdefault(span is not None, []).append(i)
+    for is_span, idx in groups.items():
+        max_tokens = max(_span_max_tokens(jobs[i][1]["text"]) for i in idx) if is_span else FULL_MAX_TOKENS
+        outs, model_label = batch_spool.run_jobs("rewrite", backend, [(jobs[i][0]["video_id"], jobs[i][2]) for i in idx],
+                                                 max_tokens=max_tokens, batch=batch)
+        for i, out in zip(idx, outs):
+            outputs[i] = out
+
+    rewrites = []
+    for (vid, span, _), raw_output in zip(jobs, outputs):
+        title = vid.get("title", "")
         cleaned = clean_text(raw_output)
 
         # ---------- Parse JSON ----------
@@ -94,12 +180,21 @@ Respond ONLY in this JSON format:
                 "style_notes": ["(Unstructured output)"]
             }
 
+        script = parsed.get("rewritten_script", "")
+        rewritten_span = None
+        if span and script:
+            # downstream (policy_guard, reporter) always gets the whole hook
+            rewritten_span = script
+            script = vid.get("first60_text", "").replace(span["text"], script, 1)
+
         rewrites.append({
             "video_id": vid["video_id"],
             "title": title,
-            "rewritten_script": parsed.get("rewritten_script", ""),
+            "rewritten_script": script,
             "style_notes": parsed.get("style_notes", []),
-            "model": "AWS Bedrock – meta.llama3-8b-instruct-v1:0"
+            "span_s": [span["start_s"], span["end_s"]] if span else None,
+            "rewritten_span": rewritten_span,
+            "model": model_label
         })
 
         print(f"✅ Rewritten: {title}")
@@ -0,0 +1,200 @@
+"""
+Pluggable LLM backends
+----------------------
+All tools generate text through `get_backend_for(tool).generate_batch(...)`.
+Backends are interchangeable:
+- "bedrock" → AWS Bedrock Runtime (shared_bedrock.py; rate limit, retry, cache)
+- "local"   → shared_model.py transformers model on local CPU/GPU
+- "fake"    → deterministic canned JSON with configurable latency (offline load tests)
+
+Select with LLM_BACKEND=<name> (default: bedrock), per tool with
+LLM_BACKEND_<TOOL>=<name> (e.g. LLM_BACKEND_POLICY=local), or `set_backend(name)`
+(used by the --backend CLI flag of uplift_graph).
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_BACKEND = os.getenv("LLM_BACKEND", "bedrock").lower()
+
+
+class LLMBackend:
+    name = "base"
+
+    @property
+    def label(self) -> str:
+        return self.name
+
+    def generate(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> str:
+        raise NotImplementedError
+
+    def generate_batch(self, prompts, max_tokens: int = 500, temperature: float = 0.7):
+        """Default: sequential. Returns outputs in input order."""
+        return [self.generate(p, max_tokens=max_tokens, temperature=temperature) for p in prompts]
+
+    def stats(self) -> dict:
+        return {}
+
+
+# === AWS Bedrock ===
+class BedrockBackend(LLMBackend):
+    name = "bedrock"
+
+    @property
+    def label(self) -> str:
+        return f"AWS Bedrock – {os.getenv('BEDROCK_MODEL_ID', 'meta.llama3-8b-instruct-v1:0')}"
+
+    def generate(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> str:
+        from bc.tools.shared_bedrock import generate_bedrock_response
+        return generate_bedrock_response(prompt, max_tokens=max_tokens, temperature=temperature)
+
+    def generate_batch(self, prompts, max_tokens: int = 500, temperature: float = 0.7):
+        from bc.tools.shared_bedrock import generate_bedrock_batch
+        return generate_bedrock_batch(prompts, max_tokens=max_tokens, temperature=temperature)
+
+    def stats(self) -> dict:
+        from bc.tools.shared_bedrock import get_bedrock_stats
+        return get_bedrock_stats()
+
+
+# === Local transformers model (shared_model.py) ===
+class LocalModelBackend(LLMBackend):
+    name = "local"
+
+    def __init__(self):
+        # one model instance → serialize generate() calls
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.total_s = 0.0
+
+    @property
+    def label(self) -> str:
+        from bc.tools.shared_model import MODEL_NAME
+        return f"Local – {MODEL_NAME}"
+
+    def generate(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> str:
+        from bc.tools import shared_model
+
+        tokenizer, model = shared_model.tokenizer, shared_model.model
+        messages = [{"role": "user", "content": prompt}]
+        with self._lock:
+            t0 = time.perf_counter()
+            inputs = tokenizer.apply_chat_template(
+                messages,
+                add_generation_prompt=True,
+                tokenize=True,
+                return_dict=True,
+                return_tensors="pt",
+            ).to(model.device)
+            gen_kwargs = {"max_new_tokens": max_tokens, "pad_token_id": tokenizer.eos_token_id}
+            if temperature > 0:
+                gen_kwargs.update(do_sample=True, temperature=temperature)
+            out = model.generate(**inputs, **gen_kwargs)
+            text = tokenizer.decode(out[0][inputs["input_ids"].shape[-1]:], skip_special_tokens=True)
+            self.calls += 1
+            self.total_s += time.perf_counter() - t0
+        return text.strip()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "avg_latency_s": round(self.total_s / self.calls, 3) if self.calls else 0.0,
+        }
+
+
+# === Deterministic fake (offline benchmarking) ===
+class FakeBackend(LLMBackend):
+    """
+    Returns canned JSON containing only the keys the prompt asks for.
+    Output is a pure function of the prompt; latency is FAKE_LLM_LATENCY_MS ± jitter.
+    """
+    name = "fake"
+
+    CANNED = {
+        "rewritten_script": "What if everything you knew about this topic was wrong? In the next minute, we'll prove it.",
+        "style_notes": ["Open with a question", "Front-load the payoff"],
+        "improved_description": "Discover the surprising truth in under a minute. Subscribe for more.",
+        "improvement_notes": ["Stronger first line", "Keywords up front", "Added CTA"],
+        "titles": ["The Truth Nobody Told You", "We Tested It So You Don't Have To", "This Changes Everything"],
+        "thumbnails": [
+            {"concept": "Close-up reaction shot", "emotion": "surprise", "contrast": "bright subject on dark background"},
+            {"concept": "Before/after split", "emotion": "curiosity", "contrast": "red vs. blue halves"},
+            {"concept": "Single bold object", "emotion": "intrigue", "contrast": "object centred, blurred backdrop"},
+        ],
+        "safe_version": "An advertiser-friendly version of the script.",
+        "advice": ["Replace graphic wording", "Keep context educational"],
+    }
+
+    def __init__(self, latency_ms: float | None = None, jitter_ms: float | None = None, workers: int | None = None):
+        self.latency_ms = float(latency_ms if latency_ms is not None else os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+        self.jitter_ms = float(jitter_ms if jitter_ms is not None else os.getenv("FAKE_LLM_JITTER_MS", "0"))
+        self.workers = int(workers or os.getenv("FAKE_LLM_WORKERS", "8"))
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    @property
+    def label(self) -> str:
+        return "Fake LLM (offline)"
+
+    def generate(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> str:
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+        delay = self.latency_ms + random.Random(seed).uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        with self._lock:
+            self.calls += 1
+        out = {k: v for k, v in self.CANNED.items() if f'"{k}"' in prompt}
+        return json.dumps(out or {"text": "ok"}, ensure_ascii=False)
+
+    def generate_batch(self, prompts, max_tokens: int = 500, temperature: float = 0.7):
+        prompts = list(prompts)
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(prompts)))) as pool:
+            return list(pool.map(lambda p: self.generate(p, max_tokens, temperature), prompts))
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "latency_ms": self.latency_ms}
+
+
+# === Registry ===
+BACKENDS = {
+    "bedrock": BedrockBackend,
+    "local": LocalModelBackend,
+    "fake": FakeBackend,
+}
+
+_instances: dict = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name: str | None = None) -> LLMBackend:
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}' (choose from {', '.join(BACKENDS)})")
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
+
+
+def get_backend_for(tool: str) -> LLMBackend:
+    """Per-tool override via LLM_BACKEND_<TOOL>, else the default backend."""
+    return get_backend(os.getenv(f"LLM_BACKEND_{tool.upper()}") or None)
+
+
+def set_backend(name: str):
+    """Switch the process-wide default backend (e.g. from a CLI flag)."""
+    global DEFAULT_BACKEND
+    get_backend(name)  # validate
+    DEFAULT_BACKEND = name.lower()
+
+
+def backend_stats() -> dict:
+    with _instances_lock:
+        return {name: b.stats() for name, b in _instances.items()}
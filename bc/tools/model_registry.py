@@ -0,0 +1,130 @@
+"""
+Lazy, shared local model registry
+---------------------------------
+One process-wide cache of (tokenizer, model) pairs used by shared_model.py and the
+Supervisor. Nothing is loaded until the first `get_model()` call, so code paths that
+never touch the local model pay no import or RAM cost.
+
+CPU knobs:
+- LOCAL_MODEL_INT8=1      → torch dynamic int8 quantization of nn.Linear layers
+- LOCAL_MODEL_THREADS=N   → torch.set_num_threads(N)
+"""
+
+import os
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+#MODEL_NAME = "google/gemma-3-270m"
+MODEL_NAME = os.getenv("LOCAL_MODEL_NAME", "meta-llama/Llama-3.2-1B-Instruct")
+#MODEL_NAME = "Qwen/Qwen2.5-0.5B-Instruct"
+
+QUANTIZE_INT8 = os.getenv("LOCAL_MODEL_INT8", "0").lower() in ("1", "true", "yes")
+NUM_THREADS = int(os.getenv("LOCAL_MODEL_THREADS", "0"))  # 0 → torch default
+
+
+@dataclass
+class LoadedModel:
+    name: str
+    tokenizer: Any
+    model: Any
+    device: Any
+    quantized: bool = False
+    load_s: float = 0.0
+    rss_mb_before: float = 0.0
+    rss_mb_after: float = 0.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def report(self) -> dict:
+        return {
+            "model": self.name,
+            "device": str(self.device),
+            "int8": self.quantized,
+            "load_s": round(self.load_s, 2),
+            "rss_mb": round(self.rss_mb_after, 1),
+            "rss_delta_mb": round(self.rss_mb_after - self.rss_mb_before, 1),
+        }
+
+
+_registry: Dict[Tuple[str, str, bool], LoadedModel] = {}
+_lock = threading.Lock()
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (psutil → /proc → peak RSS fallback)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+    except Exception:
+        return 0.0
+
+
+def get_model(name: str = MODEL_NAME, device: str | None = None,
+              quantize: bool | None = None, num_threads: int | None = None) -> LoadedModel:
+    """
+    Returns the shared LoadedModel for (name, device, quantize), loading it on first use.
+    device=None → cuda if available, else cpu. int8 quantization only applies on CPU.
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+
+    quantize = QUANTIZE_INT8 if quantize is None else quantize
+    num_threads = NUM_THREADS if num_threads is None else num_threads
+    dev = torch.device(device or ("cuda" if torch.cuda.is_available() else "cpu"))
+    quantize = quantize and dev.type == "cpu"
+    key = (name, str(dev), quantize)
+
+    with _lock:
+        if key in _registry:
+            return _registry[key]
+
+        if num_threads and num_threads > 0:
+            torch.set_num_threads(num_threads)
+
+        print(f"🧠 Loading shared model: {name} on {dev}{' (int8)' if quantize else ''} ...")
+        rss_before = _rss_mb()
+        t0 = time.perf_counter()
+        token = os.getenv("HF_TOKEN") or None
+        tokenizer = AutoTokenizer.from_pretrained(name, token=token)
+        model = AutoModelForCausalLM.from_pretrained(name, token=token)
+        model.to(dev)
+        model.eval()
+        if quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        loaded = LoadedModel(
+            name=name,
+            tokenizer=tokenizer,
+            model=model,
+            device=dev,
+            quantized=quantize,
+            load_s=time.perf_counter() - t0,
+            rss_mb_before=rss_before,
+            rss_mb_after=_rss_mb(),
+        )
+        _registry[key] = loaded
+        r = loaded.report()
+        print(f"✅ Model loaded on {dev} in {r['load_s']}s (RSS {r['rss_mb']} MB, +{r['rss_delta_mb']} MB)")
+        return loaded
+
+
+def loaded_models() -> list:
+    with _lock:
+        return [m.report() for m in _registry.values()]
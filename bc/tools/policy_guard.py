@@ -1,13 +1,13 @@
 """
 Tool: policy_guard.py
-Purpose: Checks content safety & advertiser-friendliness using AWS Bedrock.
+Purpose: Checks content safety & advertiser-friendliness using the configured LLM backend.
 Structured JSON output with clear safety fields for downstream reporting.
 """
 
 from pathlib import Path
 import json
 import re
-from bc.tools.shared_bedrock import generate_bedrock_response
+from bc.tools.llm_backends import get_backend_for
 
 # === PATHS ===
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -36,6 +36,27 @@ def clean_text(txt: str) -> str:
     txt = re.sub(r"\s+", " ", txt)
     return txt.strip()
 
+# --- Helper: prompt ---
+def build_prompt(flagged, text: str) -> str:
+    return f"""
+You are a YouTube policy compliance editor.
+
+Task: Review and sanitize the following script to meet advertiser-friendly standards.
+
+Flagged terms: {', '.join(flagged)}
+Text: {text}
+
+Respond ONLY in this JSON structure:
+{{
+  "safe_version": "Rewritten safe version of text",
+  "advice": [
+    "Short note 1",
+    "Short note 2"
+  ]
+}}
+Ensure valid JSON, no explanations.
+            """
+
 # === POLICY CHECK LOGIC ===
 def policy_guard():
     rewrites_file = SUGGESTIONS / "hook_rewrites.json"
@@ -46,43 +67,30 @@ def policy_guard():
     with open(rewrites_file, "r", encoding="utf-8") as f:
         rewrites = json.load(f)
 
-    results = []
-
+    # --- Step 1: Keyword Scan (cheap, local) ---
+    scanned = []
     for item in rewrites:
-        title = item.get("title", "")
         text = item.get("rewritten_script", "")
-        video_id = item.get("video_id", "")
-
-        # --- Step 1: Keyword Scan ---
         flagged = [w for w in RISKY_WORDS if w.lower() in text.lower()]
+        scanned.append((item, text, flagged))
+
+    # --- Step 2: Rewrite flagged items (concurrent, input order preserved) ---
+    flagged_jobs = [(i, build_prompt(flagged, text)) for i, (_, text, flagged) in enumerate(scanned) if flagged]
+    backend = get_backend_for("policy")
+    outputs = backend.generate_batch([p for _, p in flagged_jobs], max_tokens=300)
+    raw_by_index = {i: out for (i, _), out in zip(flagged_jobs, outputs)}
+
+    results = []
+    for i, (item, text, flagged) in enumerate(scanned):
+        title = item.get("title", "")
+        video_id = item.get("video_id", "")
         safe = len(flagged) == 0
 
-        # --- Step 2: Rewrite if flagged ---
         advice = []
         safe_text = text
 
         if flagged:
-            prompt = f"""
-You are a YouTube policy compliance editor.
-
-Task: Review and sanitize the following script to meet advertiser-friendly standards.
-
-Flagged terms: {', '.join(flagged)}
-Text: {text}
-
-Respond ONLY in this JSON structure:
-{{
-  "safe_version": "Rewritten safe version of text",
-  "advice": [
-    "Short note 1",
-    "Short note 2"
-  ]
-}}
-Ensure valid JSON, no explanations.
-            """
-
-            raw_output = generate_bedrock_response(prompt, max_tokens=300)
-            cleaned = clean_text(raw_output)
+            cleaned = clean_text(raw_by_index[i])
 
             try:
                 parsed = json.loads(cleaned)
@@ -103,7 +111,7 @@ Ensure valid JSON, no explanations.
             "flagged_terms": flagged,
             "safe_text": safe_text,
             "advice": advice,
-            "model": "AWS Bedrock – meta.llama3-8b-instruct-v1:0"
+            "model": backend.label
         })
 
     out_file = SUGGESTIONS / "policy_notes.json"
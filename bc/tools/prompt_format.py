@@ -0,0 +1,21 @@
+"""
+Llama-3 chat template helpers shared by Bedrock calls and batch job files.
+"""
+
+import re
+
+
+def format_llama3_prompt(prompt: str) -> str:
+    formatted_prompt = f"""
+    <|begin_of_text|><|start_header_id|>user<|end_header_id|>
+    {prompt}
+    <|eot_id|>
+    <|start_header_id|>assistant<|end_header_id|>
+    """
+    return formatted_prompt.strip()
+
+
+def extract_user_prompt(formatted_prompt: str) -> str:
+    """Inverse of format_llama3_prompt (used by backends that apply their own template)."""
+    m = re.search(r"user<\|end_header_id\|>\n    (.*)\n    <\|eot_id\|>", formatted_prompt, re.DOTALL)
+    return m.group(1) if m else formatted_prompt
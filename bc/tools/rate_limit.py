@@ -0,0 +1,133 @@
+"""
+Shared rate limiting helpers
+----------------------------
+Thread-safe token buckets used to keep concurrent workers inside an
+external API budget (requests/sec, tokens/min, ...).
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens are refilled per second up to `capacity`.
+    `acquire(n)` blocks until n tokens are available. A rate <= 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, n: float = 1.0):
+        if self.rate <= 0:
+            return
+        # a single request larger than the bucket would otherwise wait forever
+        n = min(float(n), self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return
+                wait = (n - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """
+    Combines a requests-per-second bucket with an optional tokens-per-minute bucket.
+    """
+
+    def __init__(self, rps: float = 0.0, tpm: float = 0.0):
+        self.requests = TokenBucket(rps, capacity=max(1.0, rps))
+        self.tokens = TokenBucket(tpm / 60.0, capacity=tpm) if tpm > 0 else None
+
+    def acquire(self, tokens: int = 0):
+        self.requests.acquire(1)
+        if self.tokens is not None and tokens:
+            self.tokens.acquire(tokens)
+
+
+class HostRateLimiter:
+    """
+    One TokenBucket per host (created on first use). `rates` overrides the
+    default requests/sec for specific hosts.
+    """
+
+    def __init__(self, default_rps: float, rates: dict | None = None, burst: float | None = None):
+        self.default_rps = float(default_rps)
+        self.rates = dict(rates or {})
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                rate = float(self.rates.get(host, self.default_rps))
+                b = self._buckets[host] = TokenBucket(rate, self.burst)
+            return b
+
+    def acquire(self, host: str):
+        self.bucket(host).acquire(1)
+
+
+class AimdConcurrency:
+    """
+    Adaptive concurrency gate (additive-increase / multiplicative-decrease).
+    - `on_success()` grows the limit by ~1 slot per full window of successes.
+    - `on_throttle()` halves it (at most once per `cooldown` seconds, so a burst of
+      throttles from the same window only counts once).
+    Workers wrap each call in `with gate:` to respect the current limit.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int | None = None,
+                 decrease: float = 0.5, cooldown: float = 1.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum or initial)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.inflight = 0
+        self.peak_inflight = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self.inflight >= int(self.limit):
+                self._cond.wait()
+            self.inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self.inflight)
+        return self
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self.inflight -= 1
+            self._cond.notify_all()
+        return False
+
+    def on_success(self):
+        with self._cond:
+            self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def on_throttle(self):
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.limit = max(float(self.minimum), self.limit * self.decrease)
+            self.decreases += 1
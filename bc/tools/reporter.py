@@ -67,6 +67,9 @@ def reporter():
 
         # 🧠 Hook Rewrite
         lines.append("## 🧠 Hook Rewrite")
+        if item.get("span_s"):
+            start, end = item["span_s"]
+            lines.append(f"_Rewrote the weakest span ({start:.0f}–{end:.0f}s); the rest of the hook is unchanged._\n")
         lines.append(rewritten)
         if style_notes:
             lines.append("\n**Notes on Hook Improvement:**")
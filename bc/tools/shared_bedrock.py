@@ -3,60 +3,330 @@ Shared AWS Bedrock model helper
 --------------------------------
 Handles LLM calls through AWS Bedrock Runtime.
 Ensures unified prompt formatting & decoding for all tools.
+Per-video prompts can be fanned out concurrently through
+`generate_bedrock_batch`, which respects a requests/sec + tokens/min budget.
+Generations are memoized on disk (see bedrock_cache.py) so reruns are free.
+Throttling / transient ClientErrors and transport errors (timeouts, dropped
+connections) are retried with jittered exponential backoff
+while an AIMD gate shrinks concurrency on throttling and grows it back on success.
+With streaming enabled (BEDROCK_STREAM=1 or stream=True), output is consumed via
+invoke_model_with_response_stream and cut off as soon as the first JSON object closes.
 """
 
 import os
+import re
 import json
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import boto3
-from botocore.exceptions import ClientError
+from botocore.config import Config
+from botocore.exceptions import (
+    ClientError, ReadTimeoutError, ConnectTimeoutError,
+    EndpointConnectionError, ConnectionClosedError,
+)
 from dotenv import load_dotenv
 
+from bc.tools.rate_limit import RateLimiter, AimdConcurrency
+from bc.tools import bedrock_cache
+from bc.tools.prompt_format import format_llama3_prompt
+
 load_dotenv()
 
 # === AWS CONFIG ===
 REGION = os.getenv("AWS_REGION", "us-west-2")
 MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "meta.llama3-8b-instruct-v1:0")
 
+# === CONCURRENCY / QUOTA BUDGET ===
+MAX_WORKERS = int(os.getenv("BEDROCK_MAX_WORKERS", "8"))
+REQUESTS_PER_SEC = float(os.getenv("BEDROCK_RPS", "5"))         # 0 → unlimited
+TOKENS_PER_MIN = float(os.getenv("BEDROCK_TPM", "200000"))      # 0 → unlimited
+
+_limiter = RateLimiter(rps=REQUESTS_PER_SEC, tpm=TOKENS_PER_MIN)
+
+# === RETRY / ADAPTIVE THROTTLING ===
+MAX_RETRIES = int(os.getenv("BEDROCK_MAX_RETRIES", "6"))
+BACKOFF_BASE = float(os.getenv("BEDROCK_BACKOFF_BASE", "0.5"))   # seconds
+BACKOFF_MAX = float(os.getenv("BEDROCK_BACKOFF_MAX", "20"))      # seconds
+
+# === STREAMING ===
+STREAM = os.getenv("BEDROCK_STREAM", "0").lower() in ("1", "true", "yes")
+
+THROTTLE_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceQuotaExceededException"}
+TRANSIENT_CODES = {"ServiceUnavailableException", "InternalServerException",
+                   "ModelNotReadyException", "ModelTimeoutException"}
+# network-level failures: no response at all, same backoff as TRANSIENT_CODES
+TRANSPORT_ERRORS = (ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError, ConnectionClosedError)
+
+_gate = AimdConcurrency(initial=MAX_WORKERS, minimum=1, maximum=MAX_WORKERS)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "calls": 0, "retries": 0, "throttles": 0, "failures": 0,
+    "stream_calls": 0, "early_stops": 0,
+    "ttft_total_s": 0.0, "ttft_max_s": 0.0,
+    "complete_total_s": 0.0, "complete_max_s": 0.0,
+}
+
+
+def _bump(name: str, n: int = 1):
+    with _stats_lock:
+        _stats[name] += n
+
+
+def _record_stream_timing(ttft: float, complete: float, early: bool):
+    with _stats_lock:
+        _stats["stream_calls"] += 1
+        _stats["early_stops"] += int(early)
+        _stats["ttft_total_s"] += ttft
+        _stats["ttft_max_s"] = max(_stats["ttft_max_s"], ttft)
+        _stats["complete_total_s"] += complete
+        _stats["complete_max_s"] = max(_stats["complete_max_s"], complete)
+
+
+_FENCE = re.compile(r"\s*(?:```[A-Za-z]*\s*)?")
+
+
+class JsonCompletionDetector:
+    """
+    Incremental, string/escape-aware brace matcher.
+    Feed streamed text chunks; `feed()` returns True once the first top-level
+    JSON object is closed. `end` is then the index just past its closing brace.
+    The object must open at the start of a line (optionally after a ``` fence),
+    so braces in a prose preamble (`Here is "the {plan}":`) are ignored; if no
+    such object appears the stream is simply read to the end.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.started = False
+        self.line = ""  # current preamble line, until the object opens
+        self.seen = 0
+        self.end = None
+
+    def feed(self, chunk: str) -> bool:
+        if self.end is not None:
+            return True
+        for i, ch in enumerate(chunk):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif not self.started:
+                if ch == "{" and _FENCE.fullmatch(self.line):
+                    self.started = True
+                    self.depth = 1
+                else:
+                    self.line = "" if ch == "\n" else (self.line + ch)[:64]
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = self.seen + i + 1
+                    self.seen += len(chunk)
+                    return True
+        self.seen += len(chunk)
+        return False
+
+
 # === Client ===
 try:
-    bedrock_client = boto3.client("bedrock-runtime", region_name=REGION)
+    # Retries are owned by this module (see _invoke_with_retry), not botocore.
+    bedrock_client = boto3.client(
+        "bedrock-runtime",
+        region_name=REGION,
+        config=Config(retries={"max_attempts": 1, "mode": "standard"}),
+    )
     print(f"Bedrock client initialized ({MODEL_ID}) in {REGION}")
 except Exception as e:
     print(f"Failed to init Bedrock client: {e}")
     bedrock_client = None
 
 
-def generate_bedrock_response(prompt: str, max_tokens: int = 500, temperature: float = 0.7):
+def generate_bedrock_response(prompt: str, max_tokens: int = 500, temperature: float = 0.7,
+                              use_cache: bool = True, stream: bool | None = None):
     """
     Sends a text prompt to AWS Bedrock model and returns generated text.
+    Identical (model, prompt, max_tokens, temperature, mode) calls are served from
+    the on-disk cache unless `use_cache=False` or BEDROCK_CACHE_BYPASS is set.
+    `stream=True` stops reading as soon as the first JSON object is complete; those
+    (possibly cut-short) texts are cached apart from full generations.
     """
+    formatted_prompt = format_llama3_prompt(prompt)
+    stream = STREAM if stream is None else stream
+    cache_on = use_cache and not bedrock_cache.BYPASS
+    key = bedrock_cache.make_key(MODEL_ID, formatted_prompt, max_tokens, temperature,
+                                 mode="stream-json" if stream else "full")
+    if cache_on:
+        cached = bedrock_cache.cache.get(key)
+        if cached:  # an empty entry is a stale failure, not an answer
+            return cached
+
     if not bedrock_client:
         raise RuntimeError("Bedrock client not initialized")
 
-    formatted_prompt = f"""
-    <|begin_of_text|><|start_header_id|>user<|end_header_id|>
-    {prompt}
-    <|eot_id|>
-    <|start_header_id|>assistant<|end_header_id|>
-    """
-
     payload = {
-        "prompt": formatted_prompt.strip(),
+        "prompt": formatted_prompt,
         "max_gen_len": max_tokens,
         "temperature": temperature,
     }
 
+    text = _invoke_with_retry(payload, _estimate_tokens(prompt, max_tokens), stream=stream)
+
+    # never memoize empty generations — they are failures, not answers
+    if cache_on and text:
+        bedrock_cache.cache.put(key, text)
+    return text
+
+
+def _estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough token cost of one call (≈4 chars/token for input + full output budget)."""
+    return len(prompt) // 4 + max_tokens
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _invoke_streaming(body: str) -> str:
+    """
+    Streams the generation and stops once the first JSON object is complete.
+    Records time-to-first-token and time-to-complete.
+    """
+    t0 = time.perf_counter()
+    response = bedrock_client.invoke_model_with_response_stream(
+        modelId=MODEL_ID,
+        body=body,
+        contentType="application/json"
+    )
+    stream = response["body"]
+    detector = JsonCompletionDetector()
+    parts = []
+    ttft = None
+    early = False
     try:
-        response = bedrock_client.invoke_model(
-            modelId=MODEL_ID,
-            body=json.dumps(payload),
-            contentType="application/json"
-        )
-        result = json.loads(response["body"].read())
-        return result.get("generation", "").strip()
-    except ClientError as e:
-        print(f"AWS ClientError: {e}")
-        return ""
-    except Exception as e:
-        print(f"Bedrock inference error: {e}")
-        return ""
+        for event in stream:
+            chunk = event.get("chunk")
+            if not chunk:
+                continue
+            piece = json.loads(chunk["bytes"]).get("generation", "")
+            if not piece:
+                continue
+            if ttft is None:
+                ttft = time.perf_counter() - t0
+            parts.append(piece)
+            if detector.feed(piece):
+                early = True
+                break
+    finally:
+        # closing the stream drops the connection → Bedrock stops generating
+        stream.close()
+
+    complete = time.perf_counter() - t0
+    _record_stream_timing(ttft if ttft is not None else complete, complete, early)
+    text = "".join(parts)
+    if detector.end is not None:
+        text = text[:detector.end]
+    return text.strip()
+
+
+def _invoke_with_retry(payload: dict, est_tokens: int, stream: bool = False) -> str:
+    """
+    Invokes the model, retrying throttling/transient/transport errors.
+    Returns "" only after retries are exhausted or on a non-retriable error.
+    """
+    body = json.dumps(payload)
+    for attempt in range(MAX_RETRIES + 1):
+        _limiter.acquire(est_tokens)
+        _bump("calls")
+        try:
+            with _gate:
+                if stream:
+                    text = _invoke_streaming(body)
+                else:
+                    response = bedrock_client.invoke_model(
+                        modelId=MODEL_ID,
+                        body=body,
+                        contentType="application/json"
+                    )
+                    result = json.loads(response["body"].read())
+                    text = result.get("generation", "").strip()
+            _gate.on_success()
+            return text
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code", "")
+            if code in THROTTLE_CODES:
+                _bump("throttles")
+                _gate.on_throttle()
+            elif code not in TRANSIENT_CODES:
+                print(f"AWS ClientError: {e}")
+                _bump("failures")
+                return ""
+            if attempt == MAX_RETRIES:
+                print(f"AWS ClientError after {attempt + 1} attempts: {e}")
+                _bump("failures")
+                return ""
+            _bump("retries")
+            time.sleep(_backoff(attempt))
+        except TRANSPORT_ERRORS as e:
+            if attempt == MAX_RETRIES:
+                print(f"Bedrock transport error after {attempt + 1} attempts: {e}")
+                _bump("failures")
+                return ""
+            _bump("retries")
+            time.sleep(_backoff(attempt))
+        except Exception as e:
+            print(f"Bedrock inference error: {e}")
+            _bump("failures")
+            return ""
+    return ""
+
+
+def generate_bedrock_batch(prompts, max_tokens: int = 500, temperature: float = 0.7,
+                           max_workers: int | None = None, use_cache: bool = True,
+                           stream: bool | None = None):
+    """
+    Runs many prompts concurrently (bounded thread pool, shared rate limiter).
+    Cache hits return immediately and do not consume the rate budget.
+    Returns generated texts in the same order as `prompts`.
+    """
+    prompts = list(prompts)
+    if not prompts:
+        return []
+
+    workers = max(1, min(max_workers or MAX_WORKERS, len(prompts)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bedrock") as pool:
+        return list(pool.map(
+            lambda p: generate_bedrock_response(p, max_tokens=max_tokens, temperature=temperature,
+                                                use_cache=use_cache, stream=stream),
+            prompts,
+        ))
+
+
+def get_bedrock_stats() -> dict:
+    """
+    Counters for tuning: calls/retries/throttles/failures, AIMD state,
+    streaming latency (time-to-first-token / time-to-complete) and cache hit/miss.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    n = stats["stream_calls"]
+    stats["ttft_avg_s"] = round(stats.pop("ttft_total_s") / n, 3) if n else 0.0
+    stats["complete_avg_s"] = round(stats.pop("complete_total_s") / n, 3) if n else 0.0
+    stats["ttft_max_s"] = round(stats["ttft_max_s"], 3)
+    stats["complete_max_s"] = round(stats["complete_max_s"], 3)
+    stats["concurrency_limit"] = round(_gate.limit, 2)
+    stats["peak_inflight"] = _gate.peak_inflight
+    stats["concurrency_decreases"] = _gate.decreases
+    stats["cache"] = bedrock_cache.cache.stats()
+    return stats
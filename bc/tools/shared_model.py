@@ -1,26 +1,28 @@
 """
 Shared global model loader for all tools (rewrite, title-thumb, policy).
 Ensures single memory instance for meta-llama/Llama-3.2-1B-Instruct.
+
+`model`, `tokenizer` and `device` are resolved lazily through model_registry, so
+importing this module no longer loads the model (or requires HF_TOKEN).
 """
 
-from transformers import AutoTokenizer, AutoModelForCausalLM
-import torch
 import os
 from dotenv import load_dotenv
 
+from bc.tools.model_registry import MODEL_NAME, get_model, loaded_models
+
 load_dotenv()
-print("HF_TOKEN loaded:", os.getenv("HF_TOKEN")[:10], "...")  # just to confirm it's loading
+if os.getenv("HF_TOKEN"):
+    print("HF_TOKEN loaded:", os.getenv("HF_TOKEN")[:10], "...")  # just to confirm it's loading
 
-#MODEL_NAME = "google/gemma-3-270m"
-MODEL_NAME = "meta-llama/Llama-3.2-1B-Instruct"
-#MODEL_NAME = "Qwen/Qwen2.5-0.5B-Instruct"
 
-print(f"🧠 Initializing shared global model: {MODEL_NAME} ...")
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForCausalLM.from_pretrained(MODEL_NAME)
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-model.to(device)
+def __getattr__(name):
+    # PEP 562: `from bc.tools.shared_model import model` triggers the (one-time) load
+    if name in ("model", "tokenizer", "device"):
+        return getattr(get_model(MODEL_NAME), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-print(f"✅ Model loaded on {device}")
 
-__all__ = ["model", "tokenizer", "device", "MODEL_NAME"]
+# model / tokenizer / device stay importable by name but are not in __all__:
+# `import *` must not trigger the lazy load
+__all__ = ["MODEL_NAME", "get_model", "loaded_models"]
@@ -11,10 +11,11 @@ def build_shortlist(
         return
 
     with open(hooks_path, "r", encoding="utf-8") as f:
-        hooks = json.load(f)
+        # hooks.jsonl (catalog mode) is streamed line by line
+        hooks = (json.loads(line) for line in f if line.strip()) if hooks_path.endswith(".jsonl") else json.load(f)
 
-    # filter by low hook score
-    shortlist = [h for h in hooks if h.get("hook_score", 0) < threshold]
+        # filter by low hook score
+        shortlist = [h for h in hooks if h.get("hook_score", 0) < threshold]
 
     if not shortlist:
         print("⚠️ No weak-hook videos found (all above threshold).")
@@ -1,13 +1,14 @@
 """
 Tool: title_thumb_scout.py
-Purpose: Suggests new titles and thumbnail ideas for each video using AWS Bedrock.
+Purpose: Suggests new titles and thumbnail ideas for each video using the configured LLM backend.
 Structured output enforced (JSON schema) for cleaner downstream reports.
 """
 
 from pathlib import Path
 import json
 import re
-from bc.tools.shared_bedrock import generate_bedrock_response
+from bc.tools.llm_backends import get_backend_for
+from bc.tools import batch_spool
 
 
 # === PATHS ===
@@ -35,27 +36,9 @@ def clean_text(txt: str) -> str:
     return txt.strip()
 
 
-# --- Core function ---
-def title_thumb_scout():
-    videos_file = ARTIFACTS / "videos.json"
-    if not videos_file.exists():
-        print(f"❌ No videos.json found at {videos_file}")
-        return
-
-    with open(videos_file, "r", encoding="utf-8") as f:
-        videos = json.load(f)
-
-    results = []
-
-    for vid in videos:
-        title = vid.get("title", "")
-        transcript = vid.get("first60_text", "")
-        if not transcript:
-            print(f"⚠️ Skipping {title} (no transcript)")
-            continue
-
-        # ---------- Strict JSON Prompt ----------
-        prompt = f"""
+# --- Helper: prompt ---
+def build_prompt(title: str, transcript: str) -> str:
+    return f"""
 You are a professional YouTube strategist.
 
 Analyze the following video snippet and propose optimized content ideas.
@@ -91,8 +74,35 @@ Respond ONLY in the following JSON structure:
 Ensure valid JSON — no explanations or markdown.
         """
 
-        # ---------- Model Inference ----------
-        raw_output = generate_bedrock_response(prompt, max_tokens=300)
+
+# --- Core function ---
+def title_thumb_scout(batch: bool | None = None):
+    videos_file = ARTIFACTS / "videos.json"
+    if not videos_file.exists():
+        print(f"❌ No videos.json found at {videos_file}")
+        return
+
+    with open(videos_file, "r", encoding="utf-8") as f:
+        videos = json.load(f)
+
+    # ---------- Strict JSON Prompts ----------
+    jobs = []
+    for vid in videos:
+        title = vid.get("title", "")
+        transcript = vid.get("first60_text", "")
+        if not transcript:
+            print(f"⚠️ Skipping {title} (no transcript)")
+            continue
+        jobs.append((vid, build_prompt(title, transcript)))
+
+    # ---------- Model Inference (concurrent, input order preserved) ----------
+    backend = get_backend_for("titlethumb")
+    outputs, model_label = batch_spool.run_jobs("titlethumb", backend, [(vid["video_id"], p) for vid, p in jobs],
+                                                max_tokens=300, batch=batch)
+
+    results = []
+    for (vid, _), raw_output in zip(jobs, outputs):
+        title = vid.get("title", "")
         cleaned = clean_text(raw_output)
 
         # ---------- Parse JSON ----------
@@ -106,7 +116,7 @@ Ensure valid JSON — no explanations or markdown.
             "video_id": vid["video_id"],
             "title": title,
             "ideas": ideas_json,
-            "model": "AWS Bedrock – meta.llama3-8b-instruct-v1:0"
+            "model": model_label
         })
 
         print(f"✅ Generated ideas for: {title}")
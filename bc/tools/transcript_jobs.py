@@ -0,0 +1,129 @@
+"""
+Concurrent transcript acquisition
+---------------------------------
+Two bounded pools shared by every channel in an ingest run:
+
+- captions: wide pool for YouTubeTranscriptApi (cheap, I/O bound, per-host rate limited)
+- whisper:  small pool for the yt-dlp + Whisper fallback (expensive)
+
+Videos already in the transcript cache never touch either pool. A caption miss
+hands the video over to the Whisper pool and frees its caption
+worker immediately, so caption-available videos never queue behind Whisper.
+Results land in the video dicts and are flushed to videos.json atomically.
+"""
+
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+
+from bc.tools import transcript_parse
+from bc.tools.transcript_store import store
+
+CAPTION_WORKERS = int(os.getenv("TRANSCRIPT_CAPTION_WORKERS", "8"))
+# audio downloads overlap here; the model itself runs on asr_engine's warm workers,
+# which batch whatever these threads have queued
+WHISPER_WORKERS = int(os.getenv("TRANSCRIPT_WHISPER_WORKERS", "2"))
+FIRST_SECONDS = float(os.getenv("TRANSCRIPT_FIRST_SECONDS", "60"))
+
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def _path_lock(path: Path) -> threading.Lock:
+    with _write_locks_guard:
+        return _write_locks.setdefault(str(path), threading.Lock())
+
+
+def write_json_atomic(path, data, update=None):
+    """
+    Write JSON to a temp file next to `path`, then os.replace() it. Writers of the
+    same path are serialized; `update()` (if given) runs under that lock first, so
+    in-place changes to `data` never race a concurrent dump.
+    """
+    path = Path(path)
+    with _path_lock(path):
+        if update is not None:
+            update()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+
+
+class TranscriptJobs:
+    def __init__(self, caption_workers: int = CAPTION_WORKERS, whisper_workers: int = WHISPER_WORKERS):
+        self.captions = ThreadPoolExecutor(max_workers=max(1, caption_workers), thread_name_prefix="captions")
+        self.whisper = ThreadPoolExecutor(max_workers=max(1, whisper_workers), thread_name_prefix="whisper")
+        self._lock = threading.Lock()
+        self.stats = {"cached": 0, "captions": 0, "whisper": 0, "failed": 0}
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def submit(self, video_id: str) -> Future:
+        """
+        Future that is truthy once the transcript is in the store (None on failure).
+        Cached transcripts resolve immediately: no network, no ASR, no pool slot.
+        """
+        result = Future()
+        if store.lookup(video_id) is not None or store.import_legacy_txt(video_id):
+            self._count("cached")
+            result.set_result(True)
+            return result
+        self.captions.submit(self._caption_job, video_id, result)
+        return result
+
+    def _caption_job(self, video_id: str, result: Future):
+        try:
+            text = transcript_parse.fetch_captions(video_id)
+        except Exception as e:
+            print(f"⚠️ Caption fetch failed for {video_id}: {e}")
+            text = None
+        if text:
+            self._count("captions")
+            result.set_result(text)
+            return
+        print(f"❌ YouTube transcript unavailable → queueing Whisper fallback for {video_id}")
+        self.whisper.submit(self._whisper_job, video_id, result)
+
+    def _whisper_job(self, video_id: str, result: Future):
+        try:
+            text = transcript_parse.whisper_transcribe(video_id)
+        except Exception as e:
+            print(f"⚠️ Whisper failed for {video_id}: {e}")
+            text = None
+        self._count("whisper" if text else "failed")
+        result.set_result(text)
+
+    def attach(self, videos: list, out_path) -> list:
+        """
+        Queue every video; each finished transcript's first FIRST_SECONDS (by
+        timestamp) is written into its dict as `first60_text` and `videos` is re-flushed to `out_path`. Returns the futures.
+        """
+        futures = []
+        for v in videos:
+            fut = self.submit(v["video_id"])
+
+            def _done(f, v=v):
+                text = f.result()
+
+                # exact first-N-seconds window from the segment store
+                first = store.first_seconds(v["video_id"], FIRST_SECONDS) if text else None
+
+                def _set():
+                    v["first60_text"] = first or None
+
+                write_json_atomic(out_path, videos, update=_set)
+
+            fut.add_done_callback(_done)
+            futures.append(fut)
+        return futures
+
+    def shutdown(self):
+        # caption jobs may still hand work to the whisper pool → close captions first
+        self.captions.shutdown(wait=True)
+        self.whisper.shutdown(wait=True)
@@ -1,128 +1,97 @@
 import os
 import time
 import random
-import subprocess
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 
+from bc.tools import asr_engine
+from bc.tools.audio_fetch import fetch_audio_pcm, CLIP_SECONDS
+from bc.tools.rate_limit import HostRateLimiter
+from bc.tools.transcript_store import store
+
 # Output directories
 TRANSCRIPT_DIR = "bc/outputs/transcripts"
 os.makedirs(TRANSCRIPT_DIR, exist_ok=True)
 
+# Per-host request rate for caption/audio fetches (shared by all worker threads)
+CAPTION_HOST = "www.youtube.com"
+CAPTION_RPS = float(os.getenv("YT_CAPTION_RPS", "3"))
+CAPTION_BURST = float(os.getenv("YT_CAPTION_BURST", "3"))
+host_limiter = HostRateLimiter(CAPTION_RPS, burst=CAPTION_BURST)
+
 
-# === Helper: robust audio downloader with fallbacks ===
-def download_audio_with_fallback(video_id):
+def fetch_captions(video_id, max_retries=3):
     """
-    Attempts to download the first 90 seconds of audio using yt-dlp.
-    Retries with different user agents and optional cookies if needed.
+    🔹 YouTube captions via YouTubeTranscriptApi (rate limited per host).
+    🔹 Segments go to the transcript store (timestamps kept); returns the text,
+       or None if captions are disabled/missing or every retry failed.
+       Cheap: safe to run on a wide worker pool.
     """
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    output = f"{video_id}.mp3"
-
-    user_agents = [
-        # desktop
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
-        # android mobile
-        "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Mobile Safari/537.36",
-        # ios safari
-        "Mozilla/5.0 (iPhone; CPU iPhone OS 16_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.2 Mobile Safari/604.1",
-    ]
-
-    for ua in user_agents:
+    for i in range(max_retries):
+        host_limiter.acquire(CAPTION_HOST)
         try:
-            print(f"🎧 Trying download with UA: {ua.split('(')[0].strip()}...")
-            cmd = [
-                "yt-dlp",
-                "--no-warnings",
-                "-x", "--audio-format", "mp3",
-                "--max-filesize", "50M",
-                "--postprocessor-args", "-ss 0 -t 90",
-                "--user-agent", ua,
-                "-o", output,
-                url,
-            ]
-
-            # If user has cookies.txt file, use it
-            if os.path.exists("cookies.txt"):
-                cmd[1:1] = ["--cookies", "cookies.txt"]
-
-            subprocess.run(cmd, check=True)
-
-            if os.path.exists(output):
-                print(f"✅ Download succeeded with {ua[:25]}...")
-                return output
-
-        except subprocess.CalledProcessError as e:
-            print(f"⚠️ Attempt failed with user-agent: {ua[:40]}... ({e})")
+            transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=["en"])
+            break
+        except (TranscriptsDisabled, NoTranscriptFound):
+            print(f"❌ YouTube transcript unavailable for {video_id}")
+            return None
+        except Exception as e:
+            wait = (2 ** i) + random.uniform(0, 1)
+            print(f"⚠️ Attempt {i+1} failed ({e}) — retrying in {wait:.1f}s")
+            time.sleep(wait)
+    else:
+        print(f"❌ YouTube transcript unavailable for {video_id}")
+        return None
 
-    print("❌ All user-agents failed; YouTube may require login or region cookies.")
-    return None
+    transcript_text = store.put(video_id, transcript, source="captions:en")
+    if not transcript_text:
+        return None
+    print(f"✅ YouTube transcript saved: {store.path(video_id, 'captions:en')}")
+    return transcript_text
 
 
-def get_transcript_text(video_id, max_retries=3):
+def whisper_transcribe(video_id):
     """
-    🔹 Try to fetch transcript using YouTubeTranscriptApi.
-    🔹 If it fails, fallback to Whisper ASR via yt-dlp audio.
-    🔹 Returns transcript text (first 60–90 seconds).
+    🔹 Whisper ASR fallback on the first CLIP_SECONDS of audio, streamed and
+       decoded in memory (audio_fetch: yt-dlp URL → ffmpeg pipe → NumPy).
+    🔹 Transcribed by the warm in-process asr_engine service (model loaded once).
+    🔹 Expensive (download + CPU/GPU bound): run on a small dedicated pool.
     """
-
-    def _fetch_with_retries(video_id):
-        for i in range(max_retries):
-            try:
-                transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=["en"])
-                lines = [seg["text"].strip() for seg in transcript if seg.get("text")]
-                return " ".join(lines)
-            except (TranscriptsDisabled, NoTranscriptFound):
-                raise
-            except Exception as e:
-                wait = (2 ** i) + random.uniform(0, 1)
-                print(f"⚠️ Attempt {i+1} failed ({e}) — retrying in {wait:.1f}s")
-                time.sleep(wait)
-        return None
-
-    # --- Primary: YouTube captions ---
-    try:
-        transcript_text = _fetch_with_retries(video_id)
-        if transcript_text:
-            save_path = os.path.join(TRANSCRIPT_DIR, f"{video_id}.txt")
-            with open(save_path, "w", encoding="utf-8") as f:
-                f.write(transcript_text)
-            print(f"✅ YouTube transcript saved: {save_path}")
-            return transcript_text
-        else:
-            print(f"❌ YouTube transcript unavailable → switching to Whisper fallback for {video_id}")
-    except Exception:
-        print(f"❌ YouTube transcript unavailable → switching to Whisper fallback for {video_id}")
-
-    # --- Fallback: Whisper ASR ---
     try:
-        print(f"🎧 Downloading audio for Whisper fallback ({video_id})...")
-        audio_file = download_audio_with_fallback(video_id)
-        if not audio_file:
-            print(f"⚠️ Audio download failed for {video_id}.")
+        print(f"🎧 Fetching first {CLIP_SECONDS}s of audio for Whisper fallback ({video_id})...")
+        host_limiter.acquire(CAPTION_HOST)
+        pcm = fetch_audio_pcm(video_id, seconds=CLIP_SECONDS)  # 16 kHz mono float32, no files
+        if pcm is None:
+            print(f"⚠️ Audio fetch failed for {video_id}.")
             return None
 
-        print(f"🎙️ Transcribing via Whisper (this may take a few minutes)...")
-        whisper_cmd = [
-            "whisper", audio_file,
-            "--language", "en",
-            "--model", "base",
-            "--output_dir", TRANSCRIPT_DIR
-        ]
-        subprocess.run(whisper_cmd, check=True)
+        print(f"🎙️ Transcribing via in-process Whisper ({video_id})...")
+        result = asr_engine.get_service().transcribe(pcm)  # warm model, shared queue
+        source = f"asr:{result['backend']}"
+        whisper_text = store.put(video_id, result["segments"], source=source)
+        v = result.get("vad")
+        skipped = f", VAD skipped {v['skipped_fraction']:.0%} (~{v['asr_saved_s']:.1f}s ASR saved)" if v else ""
+        if v and v["fallback"]:
+            skipped = ", VAD found no speech in audible audio → decoded the whole clip"
+        print(f"✅ Whisper transcript saved: {store.path(video_id, source)} "
+              f"({result['duration_s']:.0f}s audio, {result['asr_s']:.1f}s ASR, RTF {result['rtf']:.2f}{skipped})")
+        return whisper_text or None
 
-        whisper_out = os.path.join(TRANSCRIPT_DIR, f"{video_id}.txt")
-        if os.path.exists(whisper_out):
-            with open(whisper_out, "r", encoding="utf-8") as f:
-                whisper_text = f.read().strip()
-            print(f"✅ Whisper transcript saved: {whisper_out}")
-            return whisper_text[:1000]
-        else:
-            print(f"⚠️ Whisper output not found for {video_id}")
-            return None
-
-    except subprocess.CalledProcessError as e:
-        print(f"⚠️ Whisper fallback failed: {e}")
-        return None
     except Exception as e:
         print(f"⚠️ Whisper unexpected error: {e}")
         return None
+
+
+def get_transcript_text(video_id, max_retries=3):
+    """
+    🔹 Try to fetch transcript using YouTubeTranscriptApi.
+    🔹 If it fails, fallback to Whisper ASR via yt-dlp audio.
+    🔹 Returns the transcript text; transcript_store.first_seconds() gives exact windows.
+    (Serial helper; app_cli uses transcript_jobs for the concurrent version.)
+    """
+    if store.lookup(video_id) is not None or store.import_legacy_txt(video_id):
+        return store.text(video_id)  # cached: no caption API / ASR work
+    transcript_text = fetch_captions(video_id, max_retries=max_retries)
+    if transcript_text:
+        return transcript_text
+    print(f"❌ YouTube transcript unavailable → switching to Whisper fallback for {video_id}")
+    return whisper_transcribe(video_id)
@@ -0,0 +1,367 @@
+"""
+Timestamp-indexed transcript store / cache
+------------------------------------------
+Compressed, content-addressed cache of transcripts keyed by (video_id, source),
+where source is the caption track ("captions:en") or the ASR model
+("asr:openai-whisper/base"). One file per entry replaces the loose .txt (captions)
+and the .txt/.json/.tsv/.vtt/.srt Whisper outputs:
+
+    bc/outputs/transcripts/{sha1(video_id|source)[:20]}.seg.zst   (.seg.gz without zstandard)
+      line 1: JSON header {"video_id", "source", "duration_s", "segments": [[start, end, char_start, char_end], ...]}
+      rest:   the cleaned transcript text (segments joined by single spaces)
+
+A SQLite index (index.sqlite) maps (video_id, source) → file, codec, size and last
+access. Writes are atomic (temp file + os.replace); the cache is capped at
+TRANSCRIPT_CACHE_MAX_MB and evicts least-recently-used entries. Only ingest-path
+hits (lookup(count=True)) refresh last_access, buffered in memory and flushed in
+one write before eviction — plain reads never write to the index.
+
+first_seconds(video_id, n) reads the small header, finds the last segment starting
+before n seconds and decompresses only that many characters — no whole-transcript
+load, no re-cleaning. The default window (TRANSCRIPT_FIRST_SECONDS) is also kept
+in the index, so reruns answer it without touching transcript files.
+Ingest calls lookup() before any network or ASR work.
+"""
+
+import os
+import re
+import io
+import atexit
+import gzip
+import json
+import time
+import bisect
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+# empty (as copied from .env.example) means the default, not the current directory
+STORE_DIR = Path(os.getenv("TRANSCRIPT_STORE_DIR") or BASE_DIR / "outputs" / "transcripts")
+CODEC = os.getenv("TRANSCRIPT_CODEC", "auto").lower()  # auto | zstd | gzip
+ZSTD_LEVEL = int(os.getenv("TRANSCRIPT_ZSTD_LEVEL", "10"))
+MAX_BYTES = int(float(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+# preferred sources when a video has several: captions first, then any ASR model
+SOURCE_PREFERENCE = ("captions:", "asr:", "txt")
+LEGACY_CHARS = 1000  # old .txt transcripts have no timestamps → character window
+# the hook window is also kept in the index, so the common read needs no file I/O
+HEAD_SECONDS = float(os.getenv("TRANSCRIPT_FIRST_SECONDS", "60"))
+TOUCH_FLUSH = 256  # buffered last_access updates per index write
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip fallback
+    zstandard = None
+
+
+def _clean(t: str) -> str:
+    return re.sub(r"\s+", " ", t or "").strip()
+
+
+def _codec() -> str:
+    if CODEC == "gzip" or zstandard is None:
+        if CODEC == "zstd":
+            raise RuntimeError("TRANSCRIPT_CODEC=zstd but the zstandard package is not installed")
+        return "gzip"
+    return "zstd"
+
+
+def _rank(source: str) -> int:
+    for i, prefix in enumerate(SOURCE_PREFERENCE):
+        if source.startswith(prefix):
+            return i
+    return len(SOURCE_PREFERENCE)
+
+
+class TranscriptStore:
+    def __init__(self, root: Path = STORE_DIR, max_bytes: int = MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._touched = {}  # (video_id, source) → last_access, not yet in the index
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    video_id    TEXT NOT NULL,
+                    source      TEXT NOT NULL,
+                    file        TEXT NOT NULL,
+                    codec       TEXT NOT NULL,
+                    duration_s  REAL,
+                    segments    INTEGER,
+                    chars       INTEGER,
+                    bytes       INTEGER NOT NULL,
+                    created_at  REAL,
+                    last_access REAL,
+                    head_s      REAL,
+                    head        TEXT,
+                    PRIMARY KEY (video_id, source)
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access);
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def key(video_id: str, source: str) -> str:
+        return hashlib.sha1(f"{video_id}|{source}".encode("utf-8")).hexdigest()[:20]
+
+    # --- write ---
+    def put(self, video_id: str, segments, source: str) -> str:
+        """
+        segments: iterable of {start, end, text} (Whisper) or {start, duration, text}
+        (caption API). Returns the cleaned full text.
+        """
+        rows, parts, pos = [], [], 0
+        for s in segments:
+            text = _clean(s.get("text"))
+            if not text:
+                continue
+            start = float(s.get("start", 0.0))
+            end = float(s["end"]) if "end" in s else start + float(s.get("duration", 0.0))
+            if parts:
+                pos += 1  # joining space
+            rows.append([round(start, 2), round(end, 2), pos, pos + len(text)])
+            parts.append(text)
+            pos += len(text)
+        full = " ".join(parts)
+        if not rows:
+            return full  # nothing worth caching; a later source may fill it
+        header = {
+            "video_id": video_id,
+            "source": source,
+            "duration_s": rows[-1][1],
+            "segments": rows,
+        }
+        payload = (json.dumps(header, separators=(",", ":")) + "\n" + full).encode("utf-8")
+        if source == "txt":
+            head = full[:LEGACY_CHARS]
+        else:
+            n = bisect.bisect_left([r[0] for r in rows], HEAD_SECONDS)
+            head = full[:rows[n - 1][3]] if n else ""
+
+        codec = _codec()
+        if codec == "zstd":
+            blob = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+        else:
+            blob = gzip.compress(payload, compresslevel=9)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"{self.key(video_id, source)}.seg.{'zst' if codec == 'zstd' else 'gz'}"
+        dest = self.root / name
+        tmp = dest.with_name(f".{name}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, dest)
+
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            old = db.execute("SELECT file FROM entries WHERE video_id = ? AND source = ?",
+                             (video_id, source)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (video_id, source, name, codec, header["duration_s"], len(rows), len(full), len(blob), now, now,
+                 HEAD_SECONDS, head),
+            )
+            db.commit()
+            self.stats["writes"] += 1
+        if old and old[0] != name:
+            (self.root / old[0]).unlink(missing_ok=True)
+        self._evict()
+        return full
+
+    def import_legacy_txt(self, video_id: str, txt_dir: Path | None = None) -> bool:
+        """Adopt a pre-store {video_id}.txt (no timestamps) as source "txt"."""
+        p = Path(txt_dir or self.root) / f"{video_id}.txt"
+        if not p.exists():
+            return False
+        text = p.read_text(encoding="utf-8", errors="ignore")
+        return bool(self.put(video_id, [{"start": 0.0, "end": 0.0, "text": text}], source="txt"))
+
+    def _flush_touches(self):
+        # caller holds self._lock
+        if self._touched:
+            db = self._db()
+            db.executemany("UPDATE entries SET last_access = ? WHERE video_id = ? AND source = ?",
+                           [(t, vid, src) for (vid, src), t in self._touched.items()])
+            db.commit()
+            self._touched.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush_touches()
+
+    def _evict(self):
+        with self._lock:
+            self._flush_touches()
+            db = self._db()
+            total = db.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for vid, src, name, size in db.execute(
+                "SELECT video_id, source, file, bytes FROM entries ORDER BY last_access ASC"
+            ):
+                if total <= self.max_bytes:
+                    break
+                victims.append((vid, src, name))
+                total -= size
+            db.executemany("DELETE FROM entries WHERE video_id = ? AND source = ?", [(v, s) for v, s, _ in victims])
+            db.commit()
+            self.stats["evictions"] += len(victims)
+        for _, _, name in victims:
+            (self.root / name).unlink(missing_ok=True)
+
+    # --- lookup ---
+    def lookup(self, video_id: str, source: str | None = None, count: bool = True) -> dict | None:
+        """
+        Index row for (video_id, source), or the preferred cached source when
+        source is None. Metadata only, no file read. count=True is the ingest-path
+        check: it verifies the file exists, feeds the hit/miss stats and refreshes
+        last_access (LRU, buffered). Reads below use count=False: one SELECT, no
+        stat(), no write.
+        """
+        with self._lock:
+            db = self._db()
+            if source is None:
+                rows = db.execute("SELECT * FROM entries WHERE video_id = ?", (video_id,)).fetchall()
+            else:
+                rows = db.execute("SELECT * FROM entries WHERE video_id = ? AND source = ?",
+                                  (video_id, source)).fetchall()
+            if count:
+                rows = [r for r in rows if (self.root / r[2]).exists()]
+            if not rows:
+                self.stats["misses"] += int(count)
+                return None
+            row = min(rows, key=lambda r: _rank(r[1]))
+            if count:
+                self.stats["hits"] += 1
+                self._touched[(row[0], row[1])] = time.time()
+                if len(self._touched) >= TOUCH_FLUSH:
+                    self._flush_touches()
+        keys = ("video_id", "source", "file", "codec", "duration_s", "segments", "chars", "bytes",
+                "created_at", "last_access", "head_s", "head")
+        return dict(zip(keys, row))
+
+    def has(self, video_id: str, source: str | None = None) -> bool:
+        return self.lookup(video_id, source) is not None
+
+    def path(self, video_id: str, source: str | None = None) -> Path | None:
+        entry = self.lookup(video_id, source, count=False)
+        return self.root / entry["file"] if entry else None
+
+    # --- read ---
+    def _open(self, entry: dict):
+        # FileNotFoundError if the file vanished under the index → readers return None
+        raw = open(self.root / entry["file"], "rb")
+        if entry["codec"] == "zstd":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        else:
+            stream = gzip.GzipFile(fileobj=raw, mode="rb")
+        f = io.TextIOWrapper(stream, encoding="utf-8")
+        header = json.loads(f.readline())
+        return f, header
+
+    def segments(self, video_id: str, source: str | None = None) -> list:
+        """[[start, end, char_start, char_end], ...] without reading the text."""
+        entry = self.lookup(video_id, source, count=False)
+        if entry is None:
+            return []
+        try:
+            f, header = self._open(entry)
+        except FileNotFoundError:
+            return []
+        f.close()
+        return header["segments"]
+
+    def first_seconds(self, video_id: str, seconds: float = 60.0, source: str | None = None) -> str | None:
+        """Text of every segment that starts within the first `seconds` (None if not cached)."""
+        entry = self.lookup(video_id, source, count=False)
+        if entry is None:
+            return None
+        if entry["head"] is not None and (entry["source"] == "txt" or entry["head_s"] == seconds):
+            return entry["head"]  # served from the index, no file read
+        try:
+            f, header = self._open(entry)
+        except FileNotFoundError:
+            return None
+        with f:
+            if entry["source"] == "txt":
+                return f.read(LEGACY_CHARS)
+            rows = header["segments"]
+            n = bisect.bisect_left([r[0] for r in rows], seconds)
+            if n == 0:
+                return ""
+            return f.read(rows[n - 1][3])  # decompresses only up to this offset
+
+    def first_segments(self, video_id: str, seconds: float, source: str | None = None):
+        """
+        (rows, text) for the segments starting within the first `seconds`, read in
+        one pass; rows index into text. None if not cached or untimed (legacy txt).
+        """
+        entry = self.lookup(video_id, source, count=False)
+        if entry is None or entry["source"] == "txt":
+            return None
+        try:
+            f, header = self._open(entry)
+        except FileNotFoundError:
+            return None
+        with f:
+            rows = header["segments"]
+            n = bisect.bisect_left([r[0] for r in rows], seconds)
+            return rows[:n], (f.read(rows[n - 1][3]) if n else "")
+
+    def text(self, video_id: str, source: str | None = None) -> str | None:
+        entry = self.lookup(video_id, source, count=False)
+        if entry is None:
+            return None
+        try:
+            f, _ = self._open(entry)
+        except FileNotFoundError:
+            return None
+        with f:
+            return f.read()
+
+    def iter_video_ids(self, batch: int = 1000):
+        """Every cached video_id, streamed from its own read-only connection (flat memory)."""
+        path = self.root / "index.sqlite"
+        if not path.exists():
+            return
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            cur = conn.execute("SELECT DISTINCT video_id FROM entries ORDER BY video_id")
+            while True:
+                rows = cur.fetchmany(batch)
+                if not rows:
+                    break
+                for (vid,) in rows:
+                    yield vid
+        finally:
+            conn.close()
+
+    def after_fork(self):
+        """Drop the inherited SQLite connection in a child process."""
+        self._conn = None
+        self._lock = threading.Lock()
+        self._touched = {}
+
+    def usage(self) -> dict:
+        with self._lock:
+            self._flush_touches()
+            n, total = self._db().execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM entries").fetchone()
+            return dict(self.stats, entries=n, bytes=total, max_bytes=self.max_bytes, codec=_codec())
+
+
+# --- process-wide instance ---
+store = TranscriptStore()
+atexit.register(store.flush)  # persist buffered LRU touches
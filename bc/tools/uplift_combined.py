@@ -0,0 +1,158 @@
+"""
+Tool: uplift_combined.py
+Purpose: One multi-task LLM call per video that returns the hook rewrite,
+improved description and title/thumbnail ideas together.
+Writes the same hook_rewrites.json, description_rewrites.json and titlethumb.json
+as the three single-purpose tools, so reporter() works unchanged.
+"""
+
+from pathlib import Path
+import json
+import re
+from bc.tools.llm_backends import get_backend_for
+from bc.tools import batch_spool
+
+
+# === PATHS ===
+BASE_DIR = Path(__file__).resolve().parent.parent
+ARTIFACTS = BASE_DIR / "outputs" / "artifacts"
+SUGGESTIONS = BASE_DIR / "outputs" / "suggestions"
+SUGGESTIONS.mkdir(parents=True, exist_ok=True)
+
+
+# --- Helper: cleanup ---
+def clean_text(txt: str) -> str:
+    txt = txt.replace("```json", "").replace("```", "")
+    txt = re.sub(r"<[^>]+>", "", txt)
+    txt = re.sub(r"\s+", " ", txt)
+    return txt.strip()
+
+
+def extract_json_segment(text: str) -> str:
+    """Extract JSON object even if model surrounds it with text."""
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match:
+        return match.group(0)
+    return text
+
+
+# --- Helper: prompt ---
+def build_prompt(title: str, transcript: str, description: str) -> str:
+    return f"""
+You are a YouTube retention editor, SEO copywriter and packaging strategist.
+
+Complete ALL of the following tasks for the video below.
+
+1. Hook rewrite: rewrite the first 60–90 seconds (the "hook zone") to be clearer,
+   emotionally engaging and curiosity-driven. Open with a punchy line (surprising
+   fact, question or bold statement), stay accurate, keep it under 180 words.
+2. Description rewrite: improve discoverability and CTR. The first 2 lines must hook
+   the viewer, include keywords naturally, keep under 180 words, avoid clickbait and
+   add 1 call-to-action if missing. If no current description is given, return "".
+3. Packaging: propose 3 optimized titles and 3 thumbnail concepts.
+
+Video Title: {title}
+Transcript: {transcript}
+Current Description: {description}
+
+Respond ONLY in this JSON format:
+{{
+  "rewritten_script": "Improved hook only",
+  "style_notes": ["Short note 1", "Short note 2"],
+  "improved_description": "Rewritten description (≤180 words)",
+  "improvement_notes": ["Note 1", "Note 2", "Note 3"],
+  "titles": ["Title 1", "Title 2", "Title 3"],
+  "thumbnails": [
+    {{"concept": "Brief visual composition", "emotion": "Main emotion evoked", "contrast": "Key visual contrast or focal point"}},
+    {{"concept": "...", "emotion": "...", "contrast": "..."}},
+    {{"concept": "...", "emotion": "...", "contrast": "..."}}
+  ]
+}}
+Ensure valid JSON — no explanations or markdown.
+        """
+
+
+# === COMBINED UPLIFT LOGIC ===
+def uplift_combined(batch: bool | None = None):
+    videos_file = ARTIFACTS / "videos.json"
+    if not videos_file.exists():
+        print(f"❌ No videos.json found at {videos_file}")
+        return
+
+    with open(videos_file, "r", encoding="utf-8") as f:
+        videos = json.load(f)
+
+    print("✍️ Starting combined uplift (hook + description + titles) ...")
+
+    jobs = []
+    for vid in videos:
+        title = vid.get("title", "")
+        transcript = vid.get("first60_text", "")
+        description = vid.get("description", "")
+        if not transcript and not description:
+            print(f"⚠️ Skipping {title} (no transcript or description)")
+            continue
+        jobs.append((vid, build_prompt(title, transcript or "", description or "")))
+
+    backend = get_backend_for("uplift")
+    outputs, model_label = batch_spool.run_jobs("uplift", backend, [(vid["video_id"], p) for vid, p in jobs],
+                                                max_tokens=900, batch=batch)
+
+    rewrites, descriptions, ideas = [], [], []
+    for (vid, _), raw_output in zip(jobs, outputs):
+        title = vid.get("title", "")
+        cleaned = clean_text(raw_output)
+
+        try:
+            parsed = json.loads(extract_json_segment(cleaned))
+        except json.JSONDecodeError:
+            print(f"⚠️ JSON decode failed for {title}, saving raw output.")
+            parsed = {
+                "rewritten_script": cleaned,
+                "style_notes": ["(Unstructured output)"],
+                "improved_description": cleaned,
+                "improvement_notes": ["(Unstructured output)"],
+            }
+
+        # Same skip rules as the single-purpose tools
+        if vid.get("first60_text"):
+            rewrites.append({
+                "video_id": vid["video_id"],
+                "title": title,
+                "rewritten_script": parsed.get("rewritten_script", ""),
+                "style_notes": parsed.get("style_notes", []),
+                "model": model_label
+            })
+            ideas.append({
+                "video_id": vid["video_id"],
+                "title": title,
+                "ideas": {
+                    "titles": parsed.get("titles", []),
+                    "thumbnails": parsed.get("thumbnails", []),
+                },
+                "model": model_label
+            })
+        if vid.get("description"):
+            descriptions.append({
+                "video_id": vid["video_id"],
+                "title": title,
+                "improved_description": parsed.get("improved_description", ""),
+                "improvement_notes": parsed.get("improvement_notes", []),
+                "model": model_label
+            })
+
+        print(f"✅ Uplifted: {title}")
+
+    for name, data in [
+        ("hook_rewrites.json", rewrites),
+        ("description_rewrites.json", descriptions),
+        ("titlethumb.json", ideas),
+    ]:
+        out_file = SUGGESTIONS / name
+        with open(out_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"💾 Saved → {out_file}")
+
+
+if __name__ == "__main__":
+    uplift_combined()
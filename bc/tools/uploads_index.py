@@ -0,0 +1,126 @@
+"""
+Persistent per-channel uploads index
+------------------------------------
+SQLite store of every upload seen per channel (keyed by video_id, with publishedAt),
+plus the channel's uploads playlist ID and the ETag of the newest playlist page.
+candidate_selector uses it for incremental syncs: page only until an already-known
+video shows up, and skip paging entirely when the first page returns 304.
+Uploads that videos.list stops returning (deleted / private) are removed().
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+INDEX_PATH = Path(os.getenv("UPLOADS_INDEX_PATH", BASE_DIR / "outputs" / "cache" / "uploads.sqlite"))
+
+
+class UploadsIndex:
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS channels (
+                    channel_id  TEXT PRIMARY KEY,
+                    playlist_id TEXT NOT NULL,
+                    etag        TEXT,
+                    complete    INTEGER NOT NULL DEFAULT 0,
+                    synced_at   REAL
+                );
+                CREATE TABLE IF NOT EXISTS uploads (
+                    video_id    TEXT PRIMARY KEY,
+                    channel_id  TEXT NOT NULL,
+                    title       TEXT,
+                    publishedAt TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_uploads_channel ON uploads(channel_id, publishedAt);
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    # --- channel metadata ---
+    def get_channel(self, channel_id: str) -> dict | None:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT playlist_id, etag, complete, synced_at FROM channels WHERE channel_id = ?", (channel_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"playlist_id": row[0], "etag": row[1], "complete": bool(row[2]), "synced_at": row[3]}
+
+    def set_channel(self, channel_id: str, playlist_id: str, etag: str | None = None, complete: bool | None = None):
+        with self._lock:
+            db = self._db()
+            db.execute(
+                """INSERT INTO channels (channel_id, playlist_id, etag, complete, synced_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(channel_id) DO UPDATE SET
+                       playlist_id = excluded.playlist_id,
+                       etag = COALESCE(excluded.etag, channels.etag),
+                       complete = excluded.complete,
+                       synced_at = excluded.synced_at""",
+                (channel_id, playlist_id, etag, int(bool(complete)), time.time()),
+            )
+            db.commit()
+
+    # --- uploads ---
+    def known_ids(self, channel_id: str) -> set:
+        with self._lock:
+            rows = self._db().execute("SELECT video_id FROM uploads WHERE channel_id = ?", (channel_id,)).fetchall()
+        return {r[0] for r in rows}
+
+    def upsert(self, channel_id: str, videos):
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "INSERT OR REPLACE INTO uploads (video_id, channel_id, title, publishedAt) VALUES (?, ?, ?, ?)",
+                [(v["video_id"], channel_id, v.get("title"), v.get("publishedAt")) for v in videos],
+            )
+            db.commit()
+
+    def remove(self, video_ids) -> int:
+        """Drop uploads that no longer exist (deleted / private); returns rows removed."""
+        video_ids = list(video_ids)
+        if not video_ids:
+            return 0
+        with self._lock:
+            db = self._db()
+            before = db.total_changes
+            db.executemany("DELETE FROM uploads WHERE video_id = ?", [(vid,) for vid in video_ids])
+            db.commit()
+            return db.total_changes - before
+
+    def title(self, video_id: str) -> str | None:
+        with self._lock:
+            row = self._db().execute("SELECT title FROM uploads WHERE video_id = ?", (video_id,)).fetchone()
+        return row[0] if row else None
+
+    def after_fork(self):
+        """Drop the inherited SQLite connection in a child process."""
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def uploads(self, channel_id: str) -> list:
+        """All indexed uploads for a channel, newest first."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT video_id, title, publishedAt FROM uploads WHERE channel_id = ? ORDER BY publishedAt DESC",
+                (channel_id,),
+            ).fetchall()
+        return [{"video_id": r[0], "title": r[1], "publishedAt": r[2]} for r in rows]
+
+
+# --- process-wide instance ---
+index = UploadsIndex()
@@ -0,0 +1,195 @@
+"""
+Shared YouTube Data API clients
+-------------------------------
+Process-wide, thread-safe factories used by candidate_selector and youtube_ingest:
+
+- get_youtube(): googleapiclient Resource built from the bundled static discovery
+  document (parsed once per process, never fetched over the network). Each thread
+  gets its own Resource + httplib2.Http (httplib2 is not thread-safe), and each Http
+  keeps its connection alive across calls → a keep-alive pool of one connection
+  per worker thread.
+- get_http_session(): one pooled keep-alive requests.Session for raw REST calls.
+
+Both advertise gzip (Accept-Encoding + "(gzip)" user agent, as Google APIs require).
+All requests go through execute()/session_get(), which charge the daily quota
+budget (yt_quota.py) and record per-call metrics (yt_metrics.py).
+YT_API_ENDPOINT overrides the API base URL (e.g. http://127.0.0.1:8765/youtube/v3/
+for the local fake API used in benchmarks).
+"""
+
+import os
+import json
+import time
+import threading
+
+from dotenv import load_dotenv
+
+from bc.tools.yt_quota import budget
+from bc.tools.yt_metrics import usage
+
+load_dotenv()
+API_KEY = os.getenv("YT_API_KEY")
+API_ENDPOINT = os.getenv("YT_API_ENDPOINT", "")
+HTTP_TIMEOUT = float(os.getenv("YT_HTTP_TIMEOUT", "30"))
+POOL_SIZE = int(os.getenv("YT_HTTP_POOL_SIZE", "16"))
+USER_AGENT = "bc-uplift/1.0 (gzip)"
+
+_local = threading.local()
+_lock = threading.Lock()
+_discovery_doc = None
+_session = None
+
+
+def _discovery_document() -> dict:
+    """Bundled static discovery doc for youtube/v3, read + parsed once per process."""
+    global _discovery_doc
+    if _discovery_doc is None:
+        with _lock:
+            if _discovery_doc is None:
+                from googleapiclient.discovery_cache import get_static_doc
+                raw = get_static_doc("youtube", "v3")
+                if raw is None:
+                    raise RuntimeError("Static discovery document for youtube/v3 not bundled with googleapiclient")
+                _discovery_doc = json.loads(raw)
+    return _discovery_doc
+
+
+def _new_http():
+    import httplib2
+    from googleapiclient.http import set_user_agent
+    # httplib2 sends Accept-Encoding: gzip, deflate and reuses the connection
+    return set_user_agent(httplib2.Http(timeout=HTTP_TIMEOUT), USER_AGENT)
+
+
+def get_youtube():
+    """Thread-local YouTube Data API v3 client (no discovery fetch, keep-alive HTTP)."""
+    yt = getattr(_local, "youtube", None)
+    if yt is None:
+        if not API_KEY:
+            raise RuntimeError("YOUTUBE_API_KEY missing in .env")
+        from googleapiclient.discovery import build_from_document
+        kwargs = {"developerKey": API_KEY, "http": _new_http()}
+        if API_ENDPOINT:
+            kwargs["client_options"] = {"api_endpoint": API_ENDPOINT}
+        yt = build_from_document(_discovery_document(), **kwargs)
+        _local.youtube = yt
+    return yt
+
+
+def get_http_session():
+    """Process-wide pooled requests.Session for raw REST calls."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers.update({"Accept-Encoding": "gzip", "User-Agent": USER_AGENT})
+                _session = s
+    return _session
+
+
+def _parts_of(uri: str) -> str | None:
+    from urllib.parse import urlparse, parse_qs
+    return parse_qs(urlparse(uri).query).get("part", [None])[0]
+
+
+def execute(request, endpoint: str):
+    """
+    Charge the quota budget for `endpoint` (e.g. "videos.list"), execute the
+    googleapiclient request and record it in yt_metrics.usage.
+    """
+    cost = budget.charge(endpoint)
+    conditional = "If-None-Match" in request.headers
+    size = [0]
+    postproc = request.postproc
+
+    def _measure(resp, content):
+        size[0] = len(content or b"")
+        return postproc(resp, content)
+
+    request.postproc = _measure
+    t0 = time.perf_counter()
+    try:
+        r = request.execute()
+    except Exception as e:
+        status = getattr(getattr(e, "resp", None), "status", None)
+        not_modified = conditional and status == 304
+        usage.record(endpoint, _parts_of(request.uri), time.perf_counter() - t0,
+                     len(getattr(e, "content", b"") or b""), cost,
+                     cache="hit" if not_modified else None, error=not not_modified)
+        raise
+    usage.record(endpoint, _parts_of(request.uri), time.perf_counter() - t0, size[0], cost,
+                 cache="miss" if conditional else None)
+    return r
+
+
+def session_get(endpoint: str, url: str, params: dict | None = None):
+    """Raw REST GET on the pooled session, charged + recorded like execute()."""
+    cost = budget.charge(endpoint)
+    t0 = time.perf_counter()
+    try:
+        resp = get_http_session().get(url, params=params, timeout=HTTP_TIMEOUT)
+    except Exception:
+        usage.record(endpoint, (params or {}).get("part"), time.perf_counter() - t0, 0, cost, error=True)
+        raise
+    usage.record(endpoint, (params or {}).get("part"), time.perf_counter() - t0, len(resp.content), cost,
+                 error=resp.status_code >= 400)
+    return resp
+
+
+def api_base_url() -> str:
+    return (API_ENDPOINT or "https://www.googleapis.com/youtube/v3/").rstrip("/")
+
+
+# ------ quick benchmark: client startup + per-request overhead ------
+def _bench(n: int = 5):
+    """
+    Startup: legacy `build()` per call vs. the cached static document.
+    Per-request (only if YT_API_KEY is set): fresh connection per call vs. keep-alive.
+    """
+    from googleapiclient.discovery import build
+
+    key = API_KEY or "bench-key"
+    t0 = time.perf_counter()
+    for _ in range(n):
+        build("youtube", "v3", developerKey=key, cache_discovery=False)
+    legacy = (time.perf_counter() - t0) / n
+
+    from googleapiclient.discovery import build_from_document
+    t0 = time.perf_counter()
+    _discovery_document()
+    first = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(n):
+        build_from_document(_discovery_document(), developerKey=key, http=_new_http())
+    cached = (time.perf_counter() - t0) / n
+    print(f"client build: legacy build() {legacy * 1000:.1f} ms/call | "
+          f"static doc parse {first * 1000:.1f} ms once + {cached * 1000:.1f} ms/client")
+
+    if not API_KEY:
+        print("(set YT_API_KEY to also measure per-request latency)")
+        return
+
+    import requests
+    url = f"{api_base_url()}/videos"
+    params = {"part": "id", "id": "dQw4w9WgXcQ", "key": API_KEY}
+    t0 = time.perf_counter()
+    for _ in range(n):
+        requests.get(url, params=params, timeout=HTTP_TIMEOUT)
+    cold = (time.perf_counter() - t0) / n
+    session = get_http_session()
+    session.get(url, params=params, timeout=HTTP_TIMEOUT)  # open the connection
+    t0 = time.perf_counter()
+    for _ in range(n):
+        session.get(url, params=params, timeout=HTTP_TIMEOUT)
+    warm = (time.perf_counter() - t0) / n
+    print(f"per request: bare requests.get {cold * 1000:.1f} ms | pooled session {warm * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    _bench()
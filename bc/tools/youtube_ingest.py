@@ -1,12 +1,14 @@
 import os
 import json
-import requests
 from dotenv import load_dotenv
 
+from bc.tools.youtube_client import session_get, api_base_url
+from bc.tools.yt_metrics import usage
+
 load_dotenv()
 API_KEY = os.getenv("YT_API_KEY")
 
-YOUTUBE_API_BASE = "https://www.googleapis.com/youtube/v3"
+YOUTUBE_API_BASE = api_base_url()
 
 def get_channel_videos(channel_id: str, max_results: int = 10):
     """Fetches public videos from a channel using API key (no OAuth)."""
@@ -18,7 +20,8 @@ def get_channel_videos(channel_id: str, max_results: int = 10):
         "id": channel_id,
         "key": API_KEY
     }
-    channel_resp = requests.get(channel_url, params=channel_params).json()
+    # pooled keep-alive + gzip session; charged against the quota + instrumented
+    channel_resp = session_get("channels.list", channel_url, channel_params).json()
     if not channel_resp.get("items"):
         raise ValueError("Invalid channel ID or API error")
 
@@ -32,7 +35,7 @@ def get_channel_videos(channel_id: str, max_results: int = 10):
         "maxResults": max_results,
         "key": API_KEY
     }
-    playlist_resp = requests.get(playlist_url, params=playlist_params).json()
+    playlist_resp = session_get("playlistItems.list", playlist_url, playlist_params).json()
 
     videos = []
     for item in playlist_resp.get("items", []):
@@ -59,3 +62,4 @@ if __name__ == "__main__":
     test_channel = "UCX6OQ3DkcsbYNE6H8uQQuVA"  # MrBeast example
     vids = get_channel_videos(test_channel, max_results=5)
     save_videos(vids)
+    usage.print_summary()
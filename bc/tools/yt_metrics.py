@@ -0,0 +1,118 @@
+"""
+YouTube API call accounting
+---------------------------
+Thin per-request instrumentation for every YouTube Data API call made through
+youtube_client.execute() / youtube_client.session_get():
+
+    endpoint | parts | latency | response size | quota cost | cache hit/miss
+
+Cache hit/miss only applies to conditional requests (If-None-Match): a 304 is a
+hit, a full 200 a miss. Per-run totals (overall + per endpoint) are written to
+bc/outputs/artifacts/api_usage.json by the CLI.
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+USAGE_PATH = BASE_DIR / "outputs" / "artifacts" / "api_usage.json"
+KEEP_CALLS = os.getenv("YT_METRICS_CALLS", "0") == "1"  # also dump every call record
+
+
+def _empty() -> dict:
+    return {
+        "calls": 0,
+        "errors": 0,
+        "bytes": 0,
+        "quota_units": 0,
+        "latency_total_s": 0.0,
+        "latency_max_s": 0.0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+    }
+
+
+class ApiUsage:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.totals = _empty()
+            self.by_endpoint = {}
+            self.parts = {}
+            self.calls = []
+
+    def record(self, endpoint: str, parts: str | None, latency_s: float, size: int,
+               quota: int, cache: str | None = None, error: bool = False):
+        with self._lock:
+            ep = self.by_endpoint.setdefault(endpoint, _empty())
+            for agg in (self.totals, ep):
+                agg["calls"] += 1
+                agg["errors"] += int(error)
+                agg["bytes"] += size
+                agg["quota_units"] += quota
+                agg["latency_total_s"] += latency_s
+                agg["latency_max_s"] = max(agg["latency_max_s"], latency_s)
+                if cache == "hit":
+                    agg["cache_hits"] += 1
+                elif cache == "miss":
+                    agg["cache_misses"] += 1
+            if parts:
+                self.parts.setdefault(endpoint, set()).update(p for p in parts.split(",") if p)
+            if KEEP_CALLS:
+                self.calls.append({
+                    "endpoint": endpoint, "parts": parts, "latency_s": round(latency_s, 4),
+                    "bytes": size, "quota": quota, "cache": cache, "error": error,
+                })
+
+    def summary(self) -> dict:
+        def _fmt(agg: dict) -> dict:
+            out = dict(agg)
+            n = out["calls"]
+            out["latency_avg_s"] = round(out["latency_total_s"] / n, 4) if n else 0.0
+            out["latency_total_s"] = round(out["latency_total_s"], 3)
+            out["latency_max_s"] = round(out["latency_max_s"], 4)
+            return out
+
+        with self._lock:
+            data = {
+                "started_at": self.started,
+                "wall_s": round(time.time() - self.started, 2),
+                "totals": _fmt(self.totals),
+                "by_endpoint": {
+                    name: dict(_fmt(agg), parts=sorted(self.parts.get(name, ())))
+                    for name, agg in sorted(self.by_endpoint.items())
+                },
+            }
+            if KEEP_CALLS:
+                data["calls"] = list(self.calls)
+        return data
+
+    def write(self, path: Path = USAGE_PATH) -> dict:
+        data = self.summary()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return data
+
+    def print_summary(self):
+        s = self.summary()
+        t = s["totals"]
+        print(f"📡 YouTube API: {t['calls']} calls | {t['quota_units']} quota units | "
+              f"{t['bytes'] / 1024:.1f} KiB | {t['latency_total_s']:.2f}s in requests | "
+              f"cache {t['cache_hits']} hit / {t['cache_misses']} miss | {t['errors']} errors")
+        for name, ep in s["by_endpoint"].items():
+            print(f"   - {name:<20} {ep['calls']:>5} calls  {ep['quota_units']:>5} units  "
+                  f"{ep['bytes'] / 1024:>8.1f} KiB  avg {ep['latency_avg_s'] * 1000:.0f} ms  "
+                  f"max {ep['latency_max_s'] * 1000:.0f} ms  parts={','.join(ep['parts'])}")
+
+
+# --- process-wide recorder ---
+usage = ApiUsage()
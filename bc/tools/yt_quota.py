@@ -0,0 +1,122 @@
+"""
+YouTube Data API quota budget
+-----------------------------
+Tracks quota units spent per (Pacific-time) day across runs and stops requests
+before the daily budget is exhausted. Every YouTube call goes through
+youtube_client.execute()/session_get(), which charges this budget first.
+
+Schedulers (app_cli multi-channel ingest) reserve an estimated cost before
+dispatching a unit of work, so nothing new starts once the budget can't cover it.
+"""
+
+import os
+import json
+import threading
+import datetime as dt
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+QUOTA_PATH = Path(os.getenv("YT_QUOTA_PATH", BASE_DIR / "outputs" / "cache" / "yt_quota.json"))
+DAILY_BUDGET = int(os.getenv("YT_DAILY_QUOTA", "10000"))
+
+# https://developers.google.com/youtube/v3/determine_quota_cost
+QUOTA_COSTS = {
+    "channels.list": 1,
+    "playlistItems.list": 1,
+    "videos.list": 1,
+    "playlists.list": 1,
+    "commentThreads.list": 1,
+    "captions.list": 50,
+    "search.list": 100,
+}
+
+
+class QuotaExhausted(RuntimeError):
+    pass
+
+
+def _quota_day() -> str:
+    # the YouTube quota resets at midnight Pacific time
+    return dt.datetime.now(ZoneInfo("America/Los_Angeles")).date().isoformat()
+
+
+class QuotaBudget:
+    def __init__(self, daily_budget: int = DAILY_BUDGET, path: Path = QUOTA_PATH):
+        self.daily_budget = daily_budget
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.day = _quota_day()
+        self.used = 0
+        self.reserved = 0
+        self.by_endpoint = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("day") == self.day:
+                self.used = int(data.get("used", 0))
+                self.by_endpoint = dict(data.get("by_endpoint", {}))
+        except (OSError, ValueError):
+            pass
+
+    def _roll_day(self):
+        today = _quota_day()
+        if today != self.day:
+            self.day, self.used, self.by_endpoint = today, 0, {}
+
+    def save(self):
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"day": self.day, "used": self.used, "by_endpoint": self.by_endpoint}, f, indent=2)
+            os.replace(tmp, self.path)
+
+    def remaining(self) -> int:
+        with self._lock:
+            self._roll_day()
+            return self.daily_budget - self.used
+
+    def charge(self, endpoint: str, units: int | None = None):
+        """Charge one request; raises QuotaExhausted instead of overspending."""
+        cost = QUOTA_COSTS.get(endpoint, 1) if units is None else units
+        with self._lock:
+            self._roll_day()
+            if self.used + cost > self.daily_budget:
+                raise QuotaExhausted(
+                    f"YouTube quota exhausted: {self.used}/{self.daily_budget} units used, {endpoint} needs {cost}"
+                )
+            self.used += cost
+            self.by_endpoint[endpoint] = self.by_endpoint.get(endpoint, 0) + cost
+        return cost
+
+    # --- scheduler reservations ---
+    def try_reserve(self, units: int) -> bool:
+        """Reserve headroom for a unit of work; False if the budget can't cover it."""
+        with self._lock:
+            self._roll_day()
+            if self.used + self.reserved + units > self.daily_budget:
+                return False
+            self.reserved += units
+            return True
+
+    def release(self, units: int):
+        with self._lock:
+            self.reserved = max(0, self.reserved - units)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "day": self.day,
+                "daily_budget": self.daily_budget,
+                "used": self.used,
+                "remaining": self.daily_budget - self.used,
+                "by_endpoint": dict(self.by_endpoint),
+            }
+
+
+# --- process-wide budget ---
+budget = QuotaBudget()